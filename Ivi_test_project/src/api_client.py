@@ -7,7 +7,21 @@ from config import API_BASE_URL, USERNAME, PASSWORD
 from src.logger import log_request_response, logger
 
 
-class BaseHttpClient:
+class ResponseValidationMixin:
+    """Schema validation shared by the sync and async clients."""
+
+    @allure.step("Validate response body")
+    def validate_response(self, data: dict, schema):
+        logger.info("Starting validation of response data.")
+        try:
+            schema().load(data)
+            logger.info("Response data validated successfully.")
+        except ValidationError as err:
+            logger.error(f"Response validation failed: {err.messages}")
+            raise AssertionError(f"Response validation failed: {err.messages}")
+
+
+class BaseHttpClient(ResponseValidationMixin):
     def __init__(self):
         self.session = requests.Session()
 
@@ -23,16 +37,6 @@ class BaseHttpClient:
             logger.error(f"Request error: {method} {url}: {e}")
             raise
 
-    @allure.step("Validate response body")
-    def validate_response(self, data: dict, schema):
-        logger.info("Starting validation of response data.")
-        try:
-            schema().load(data)
-            logger.info("Response data validated successfully.")
-        except ValidationError as err:
-            logger.error(f"Response validation failed: {err.messages}")
-            raise AssertionError(f"Response validation failed: {err.messages}")
-
 
 class CharacterClient(BaseHttpClient):
     def __init__(self, api_base_url=None, username=USERNAME, password=PASSWORD, timeout=5):
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import random
+from typing import Iterable, List, Optional
+
+import httpx
+
+from config import API_BASE_URL, USERNAME, PASSWORD
+from src.api_client import ResponseValidationMixin
+from src.logger import logger
+
+# Responses worth another try: the server or a proxy in front of it is overloaded or restarting
+RETRY_STATUSES = {429, 502, 503, 504}
+# Methods safe to send twice; other methods are only retried when the request never reached the server
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# httpx logs every request at INFO, and src.logger sets the root logger to INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class AsyncCharacterClient(ResponseValidationMixin):
+    """Async client sharing one keep-alive httpx connection pool.
+
+    The *_many helpers fan requests out with at most `concurrency` in flight
+    and return the responses in input order. Requests are logged at DEBUG
+    level only, so that thousands per second can be sent from one process.
+
+        async with AsyncCharacterClient(concurrency=100) as client:
+            responses = await client.get_many(names)
+    """
+
+    def __init__(
+        self,
+        api_base_url=None,
+        username=USERNAME,
+        password=PASSWORD,
+        timeout=5,
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=30.0,
+        concurrency=50,
+        retries=3,
+        backoff=0.1,
+        max_backoff=2.0,
+    ):
+        self.api_base_url = api_base_url or API_BASE_URL
+        if not self.api_base_url:
+            raise ValueError("API_BASE_URL is not set.")
+        self.client = httpx.AsyncClient(
+            auth=(username, password) if username else None,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Exponential backoff with full jitter, or the server's Retry-After when it sent one."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.backoff * 2 ** attempt, self.max_backoff))
+
+    async def make_request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        retryable = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if last_attempt or not (retryable or isinstance(e, NOT_SENT_ERRORS)):
+                    logger.error(f"Request error: {method} {url}: {e}")
+                    raise
+                logger.warning(f"Retrying {method} {url} after error: {e}")
+                await asyncio.sleep(self._delay(attempt))
+                continue
+
+            elapsed = response.elapsed.total_seconds()
+            logger.debug(f"{method} {response.url} -> {response.status_code} in {elapsed:.3f}s")
+            if response.status_code not in RETRY_STATUSES or not retryable or last_attempt:
+                return response
+            logger.warning(f"Retrying {method} {url} after status {response.status_code}")
+            await asyncio.sleep(self._delay(attempt, response))
+
+    async def get_characters(self, **params) -> httpx.Response:
+        return await self.make_request('GET', f'{self.api_base_url}/characters', params=params)
+
+    async def get_character_by_name(self, name: str) -> httpx.Response:
+        return await self.make_request('GET', f'{self.api_base_url}/character', params={'name': name})
+
+    async def add_character(self, character_data: dict) -> httpx.Response:
+        return await self.make_request('POST', f'{self.api_base_url}/character', json=character_data)
+
+    async def update_character(self, character_data: dict) -> httpx.Response:
+        return await self.make_request('PUT', f'{self.api_base_url}/character', json=character_data)
+
+    async def delete_character(self, name: str) -> httpx.Response:
+        return await self.make_request('DELETE', f'{self.api_base_url}/character', params={'name': name})
+
+    async def _fan_out(self, request, items: Iterable) -> List[httpx.Response]:
+        """Call request(item) for every item, at most `concurrency` at a time, keeping the input order."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(item):
+            async with semaphore:
+                return await request(item)
+
+        return await asyncio.gather(*(bounded(item) for item in items))
+
+    async def get_many(self, names: Iterable[str]) -> List[httpx.Response]:
+        return await self._fan_out(self.get_character_by_name, names)
+
+    async def add_many(self, characters: Iterable[dict]) -> List[httpx.Response]:
+        return await self._fan_out(self.add_character, characters)
+
+    async def delete_many(self, names: Iterable[str]) -> List[httpx.Response]:
+        return await self._fan_out(self.delete_character, names)
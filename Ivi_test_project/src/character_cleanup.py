@@ -17,15 +17,81 @@ API_PASSWORD = os.getenv("API_PASSWORD", "")
 if not API_USERNAME or not API_PASSWORD:
     raise ValueError("API_USERNAME and API_PASSWORD must be set in environment variables or .env file")
 
+# Page size of filtered list requests
+LIST_PAGE_SIZE = 1000
+# Names per bulk delete request
+BULK_DELETE_CHUNK_SIZE = 1000
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def get_all_characters():
-    """ Get all characters from API and return a list. """
+def export_all_characters(session):
+    """ Stream all characters from the NDJSON export endpoint, or None if the API has no export. """
+    logger.info(f"Sending request: GET {API_BASE_URL}/characters/export")
+    with session.get(f"{API_BASE_URL}/characters/export", params={"format": "ndjson"}, stream=True) as response:
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return [json.loads(line) for line in response.iter_lines() if line]
+
+def criteria_params(**criteria):
+    """ Translate search criteria into list filter query parameters. """
+    params = {}
+    for key, value in criteria.items():
+        if value is None:
+            continue
+        if key in ("height", "weight"):
+            # Exact match as an inclusive range
+            params[f"min_{key}"] = params[f"max_{key}"] = value
+        else:
+            params[key] = value
+    return params
+
+def get_filtered_characters(session, params):
+    """ Fetch the characters matching the filters page by page; APIs without filters return everything.
+
+    An API without cursor pagination answers a full page without next_cursor: there may be
+    more characters, so the whole table is read from the export instead (main() filters it).
+    Without an export either, a RuntimeError is raised rather than working on a truncated list.
+    """
+    characters = []
+    page_params = {**params, "limit": LIST_PAGE_SIZE, "cursor": ""}
+    while True:
+        logger.info(f"Sending request: GET {API_BASE_URL}/characters with {page_params}")
+        response = session.get(f"{API_BASE_URL}/characters", params=page_params)
+        response.raise_for_status()
+        data = response.json()
+        page = data.get("result", [])
+        if "next_cursor" not in data and len(page) == LIST_PAGE_SIZE:
+            logger.warning("The API ignored the cursor and returned a full page; reading the export instead.")
+            exported = export_all_characters(session)
+            if exported is None:
+                raise RuntimeError(
+                    f"GET /characters returned {LIST_PAGE_SIZE} characters without next_cursor and the API has "
+                    "no export: the list may be truncated"
+                )
+            return exported
+        characters.extend(page)
+        if not data.get("next_cursor"):
+            return characters
+        page_params["cursor"] = data["next_cursor"]
+
+def get_all_characters(**criteria):
+    """ Get all characters matching the criteria from API and return a list. """
     session = requests.Session()
     session.auth = HTTPBasicAuth(API_USERNAME, API_PASSWORD)
     try:
+        params = criteria_params(**criteria)
+        if params:
+            # Let the API filter instead of downloading the whole table
+            characters = get_filtered_characters(session, params)
+            logger.info("Data successfully retrieved.")
+            return characters
+        characters = export_all_characters(session)
+        if characters is not None:
+            logger.info("Data successfully retrieved from export.")
+            return characters
         logger.info(f"Sending request: GET {API_BASE_URL}/characters")
         response = session.get(f"{API_BASE_URL}/characters")
         response.raise_for_status()
@@ -50,16 +116,38 @@ def filter_characters_by_criteria(characters, **criteria):
             logger.info(f"Character information: {json.dumps(character, ensure_ascii=False, indent=4)}")
     return matched_characters
 
+def bulk_delete_characters(session, names):
+    """ Delete the named characters in one request; None if the API has no bulk delete. """
+    logger.info(f"Sending request: POST {API_BASE_URL}/characters/bulk-delete for {len(names)} names")
+    response = session.post(
+        f"{API_BASE_URL}/characters/bulk-delete", json={"names": names, "max_rows": max(len(names), 1)}
+    )
+    if response.status_code in (404, 405):
+        return None
+    response.raise_for_status()
+    return len(response.json()["deleted"])
+
 def delete_characters_by_name(character_names, limit=None):
     """ Delete characters by names up to the specified limit. """
     session = requests.Session()
     session.auth = HTTPBasicAuth(API_USERNAME, API_PASSWORD)
-    deletion_count = 0
+    names = [character.get('name') for character in character_names]
+    if limit is not None:
+        names = names[:limit]
+
+    deletion_count, start = 0, 0
+    try:
+        while start < len(names):
+            deleted = bulk_delete_characters(session, names[start:start + BULK_DELETE_CHUNK_SIZE])
+            if deleted is None:
+                break
+            deletion_count += deleted
+            start += BULK_DELETE_CHUNK_SIZE
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Bulk deletion error, deleting one by one: {e}")
 
-    for character in character_names:
-        name = character.get('name')
-        if limit is not None and deletion_count >= limit:
-            break
+    # The rest one DELETE per character, for APIs without bulk delete
+    for name in names[start:]:
         try:
             logger.info(f"Deleting character: {name}")
             response = session.delete(f"{API_BASE_URL}/character", params={'name': name})
@@ -73,7 +161,8 @@ def delete_characters_by_name(character_names, limit=None):
 
 def main(perform_search=False, perform_deletion=False, limit=None, **criteria):
     """ Main script logic: search and delete characters by criteria. """
-    all_characters = get_all_characters()
+    all_characters = get_all_characters(**criteria)
+    # Still checked locally: APIs without server-side filters return every character
     matched_characters = filter_characters_by_criteria(all_characters, **criteria)
 
     if perform_search:
@@ -1,26 +1,43 @@
+"""Load profile of the Character API, modeled on production traffic.
+
+Requests go through locust's FastHttpUser client, so every one of them is
+recorded in locust's statistics, and nothing is logged per request. The mix is
+mostly lookups by name, some list pages and a few writes on characters the
+user created itself.
+
+    locust -f tests/integration/locustfile.py --host http://localhost:8000
+    ENV=prod locust -f tests/integration/locustfile.py
+    locust -f tests/integration/locustfile.py --host http://localhost:8000 --headless \\
+        -u 100 -r 20 -t 5m --csv results/characters --max-p95-ms 200 --max-fail-ratio 0.01
+
+At the end of a run the process exits with status 1 when the failure ratio, the
+p95 or the p99 of all requests is above its threshold.
+"""
 import logging
+import os
 import random
+import uuid
 
-import allure
+from dotenv import load_dotenv
 from faker import Faker
-from locust import HttpUser, TaskSet, task, between
-
-import config
-from src.api_client import CharacterClient
-from src.models import Character
-
-# Setup logging
-logging.basicConfig(
-    filename='test_report.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+from locust import FastHttpUser, between, events, task
+
+load_dotenv()
+
+try:
+    import config
+except ValueError:
+    # config.py needs ENV to pick the URL; without it the host must come from --host
+    config = None
+
 logger = logging.getLogger(__name__)
 
-# Initialize Faker for generating random data
 fake = Faker()
 
-# Example data for random selection
+# Names looked up by GET /character, collected from the first list page the users read
+LIST_PAGE_SIZE = 100
+known_names = []
+
 educations = [
     "High school graduate", "College graduate", "Ph.D. in Biophysics", "Unrevealed",
     "Military training", "FBI training", "High school dropout", "University graduate",
@@ -43,58 +60,104 @@ weights = [103.0, 122.0, 78.0, 67.5, 45.45, 191.25, 108.0, 82.35, 150.0, 146.0,
            90.0]
 
 
-def create_random_character():
-    """Create a Character object with random data."""
-    return Character(
-        name=f"load_{fake.first_name()}",
-        universe=random.choice(universes),
-        education=random.choice(educations),
-        weight=111,
-        height=111,
-        identity=random.choice(identities)
-    ).to_dict()
-
-
-class APITasks(TaskSet):
+def create_random_character() -> dict:
+    """Random character data with a name no other user will pick."""
+    return {
+        "name": f"load_{fake.first_name()}_{uuid.uuid4().hex[:8]}",
+        "universe": random.choice(universes),
+        "education": random.choice(educations),
+        "weight": random.choice(weights),
+        "height": random.choice(heights),
+        "identity": random.choice(identities),
+    }
+
+
+@events.init_command_line_parser.add_listener
+def add_threshold_arguments(parser):
+    parser.add_argument("--max-fail-ratio", type=float, default=0.01, help="Highest accepted share of failures.")
+    parser.add_argument("--max-p95-ms", type=float, default=500, help="Highest accepted p95 of all requests.")
+    parser.add_argument("--max-p99-ms", type=float, default=1000, help="Highest accepted p99 of all requests.")
+
+
+@events.quitting.add_listener
+def check_thresholds(environment, **kwargs):
+    """Fail the run when the totals are over the thresholds."""
+    total = environment.stats.total
+    options = environment.parsed_options
+    if options is None or total.num_requests == 0:
+        return
+    checks = (
+        ("failure ratio", total.fail_ratio, options.max_fail_ratio),
+        ("p95 ms", total.get_response_time_percentile(0.95), options.max_p95_ms),
+        ("p99 ms", total.get_response_time_percentile(0.99), options.max_p99_ms),
+    )
+    failed = [f"{label} {value:.3f} > {limit}" for label, value, limit in checks if value > limit]
+    if failed:
+        logger.error(f"Thresholds exceeded: {', '.join(failed)}")
+        environment.process_exit_code = 1
+    else:
+        logger.info("All thresholds met")
+
+
+class CharacterUser(FastHttpUser):
+    host = config.API_BASE_URL if config else None
+    wait_time = between(0.5, 2)
 
     def on_start(self):
-        self.api_client = CharacterClient()
-
-    @task
-    @allure.story("Get characters list")
-    def test_get_characters(self):
-        """Send a request to get character list and log the result."""
-        response = self.api_client.get_characters()
-        if response.status_code == 200:
-            logger.info(f"Retrieved characters: {response.json()}")
-        else:
-            logger.error(f"Error retrieving characters: {response.status_code}")
-
-    @task
-    @allure.story("Create new random character")
-    def test_create_random_character(self):
-        """Create a new random character and log the result."""
+        username = os.getenv("API_USERNAME")
+        self.auth = (username, os.getenv("API_PASSWORD")) if username else None
+        self.created_names = []
+        if not known_names:
+            self.read_list_page()
+
+    def send(self, method: str, path: str, name: str, **kwargs):
+        return self.client.request(method, path, name=name, auth=self.auth, **kwargs)
+
+    def read_list_page(self, skip: int = 0):
+        with self.send(
+            "GET", "/characters", "/characters", params={"skip": skip, "limit": LIST_PAGE_SIZE}, catch_response=True
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"status {response.status_code}")
+                return
+            if not known_names:
+                known_names.extend(character["name"] for character in response.json()["result"])
+
+    @task(70)
+    def get_character_by_name(self):
+        if not known_names:
+            return
+        self.send("GET", "/character", "/character?name=[name]", params={"name": random.choice(known_names)})
+
+    @task(20)
+    def get_list_page(self):
+        self.read_list_page(skip=random.randrange(0, 10) * LIST_PAGE_SIZE)
+
+    @task(4)
+    def create_character(self):
         character_data = create_random_character()
-        response = self.api_client.add_character(character_data)
-        if response.status_code == 200:
-            self.last_created_character_name = character_data['name']
-            logger.info(f"Created new character: {self.last_created_character_name}")
-        else:
-            logger.error(f"Error creating character: {response.status_code}")
-
-    @task
-    @allure.story("Delete randomly created character")
-    def test_delete_character(self):
-        """Delete the last created character and log the result."""
-        if hasattr(self, 'last_created_character_name'):
-            response = self.api_client.delete_character(self.last_created_character_name)
+        with self.send("POST", "/character", "/character", json=character_data, catch_response=True) as response:
             if response.status_code == 200:
-                logger.info(f"Deleted character: {self.last_created_character_name}")
+                self.created_names.append(character_data["name"])
             else:
-                logger.error(f"Error deleting character: {response.status_code}")
+                response.failure(f"status {response.status_code}")
 
-
-class WebsiteUser(HttpUser):
-    tasks = [APITasks]
-    wait_time = between(1, 5)
-    host = config.API_URLS['prod']
+    @task(3)
+    def update_character(self):
+        if not self.created_names:
+            return
+        character_data = create_random_character()
+        character_data["name"] = random.choice(self.created_names)
+        self.send("PUT", "/character", "/character", json=character_data)
+
+    @task(3)
+    def delete_character(self):
+        if not self.created_names:
+            return
+        name = self.created_names.pop()
+        self.send("DELETE", "/character", "/character?name=[name]", params={"name": name})
+
+    def on_stop(self):
+        # Leave the database as it was
+        for name in self.created_names:
+            self.send("DELETE", "/character", "/character?name=[name]", params={"name": name})
@@ -1,9 +1,10 @@
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from http import HTTPStatus
 
 import allure
 import pytest
 
+from src.async_api_client import AsyncCharacterClient
 from src.character_data import CHARACTER_DATA, MOST_COMMON_CHARACTER_NAMES
 from src.schemas import CharacterResponseSchema, CharactersListSchema
 from src.utils.create_random_character import create_random_character
@@ -178,7 +179,7 @@ class TestCharactersAPI:
 
 
 @allure.story('Stress: Parallel character addition')
-def test_parallel_add_characters(character_client, characters_to_cleanup):
+def test_parallel_add_characters(characters_to_cleanup):
     def create_unique_character():
         character = create_random_character()
         character["name"] = f"_{character["name"]}_"
@@ -186,13 +187,14 @@ def test_parallel_add_characters(character_client, characters_to_cleanup):
 
     characters = [create_unique_character() for _ in range(10)]
 
-    def add_character_and_cleanup(character):
-        response = character_client.add_character(character)
+    async def add_characters():
+        async with AsyncCharacterClient(concurrency=5) as client:
+            return await client.add_many(characters)
+
+    responses = asyncio.run(add_characters())
+    for character, response in zip(characters, responses):
         if response.status_code == HTTPStatus.OK:
             characters_to_cleanup.append(character["name"])
-        return response.status_code
-
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        results = list(executor.map(add_character_and_cleanup, characters))
 
-    assert all(status == HTTPStatus.OK for status in results), "Not all characters were added successfully."
+    assert all(response.status_code == HTTPStatus.OK for response in responses), \
+        "Not all characters were added successfully."
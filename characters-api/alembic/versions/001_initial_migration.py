@@ -19,10 +19,27 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Tables are created automatically via Base.metadata.create_all()
-    pass
+    # Databases created before migrations existed already have the table from Base.metadata.create_all()
+    if sa.inspect(op.get_bind()).has_table("characters"):
+        return
+
+    op.create_table(
+        "characters",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("education", sa.String(), nullable=True),
+        sa.Column("height", sa.Float(), nullable=True),
+        sa.Column("identity", sa.String(), nullable=True),
+        sa.Column("other_aliases", sa.String(), nullable=True),
+        sa.Column("universe", sa.String(), nullable=True),
+        sa.Column("weight", sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_characters_id", "characters", ["id"], unique=False)
+    op.create_index("ix_characters_name", "characters", ["name"], unique=True)
 
 
 def downgrade() -> None:
-    # Tables are managed via Base.metadata
-    pass
+    op.drop_index("ix_characters_name", table_name="characters")
+    op.drop_index("ix_characters_id", table_name="characters")
+    op.drop_table("characters")
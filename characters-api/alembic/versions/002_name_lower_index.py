@@ -0,0 +1,52 @@
+"""Case-insensitive name index
+
+Revision ID: 002_name_lower
+Revises: 001_initial
+Create Date: 2026-10-18 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_name_lower'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Case duplicates listed in the error when the unique index cannot be created
+MAX_REPORTED_DUPLICATES = 20
+
+
+def upgrade() -> None:
+    # The unique index would fail on names differing only by case; name them all instead
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT lower(name), count(*) FROM characters GROUP BY lower(name) HAVING count(*) > 1 ORDER BY lower(name)"
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"{name!r} ({count} rows)" for name, count in duplicates[:MAX_REPORTED_DUPLICATES])
+        raise RuntimeError(
+            f"{len(duplicates)} character names exist in several spellings ({listed}). "
+            "Rename or delete the extra rows, then run the migration again."
+        )
+
+    # Functional index used by every lookup on lower(name); unique so that
+    # "Thor" and "thor" can no longer both be inserted. IF NOT EXISTS because
+    # Base.metadata.create_all() already creates it on fresh databases.
+    op.create_index(
+        "ix_characters_name_lower",
+        "characters",
+        [sa.text("lower(name)")],
+        unique=True,
+        if_not_exists=True,
+    )
+    # The case-sensitive unique index of 001 is implied by the one above and only slows down writes
+    op.drop_index("ix_characters_name", table_name="characters", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_characters_name", "characters", ["name"], unique=True, if_not_exists=True)
+    op.drop_index("ix_characters_name_lower", table_name="characters")
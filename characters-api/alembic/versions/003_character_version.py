@@ -0,0 +1,34 @@
+"""Character version column
+
+Revision ID: 003_version
+Revises: 002_name_lower
+Create Date: 2026-10-18 13:40:07.552913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_version'
+down_revision: Union[str, None] = '002_name_lower'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Row version behind the ETags of the read routes; existing rows start at 1
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("characters")}
+    if "version" in columns:
+        # Created by Base.metadata.create_all() on a fresh database
+        return
+    op.add_column(
+        "characters",
+        sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("characters", "version")
@@ -0,0 +1,50 @@
+"""Indexes for the list filters
+
+Revision ID: 004_list_filters
+Revises: 003_version
+Create Date: 2026-10-18 16:05:22.734810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_list_filters'
+down_revision: Union[str, None] = '003_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Equality filters, with id second so filtered pages come out in id order straight from the index
+EQUALITY_INDEXES = {
+    "ix_characters_universe_id": ["universe", "id"],
+    "ix_characters_identity_id": ["identity", "id"],
+    "ix_characters_education_id": ["education", "id"],
+}
+RANGE_INDEXES = {
+    "ix_characters_height": ["height"],
+    "ix_characters_weight": ["weight"],
+}
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS because Base.metadata.create_all() already creates them on fresh databases
+    for name, columns in {**EQUALITY_INDEXES, **RANGE_INDEXES}.items():
+        op.create_index(name, "characters", columns, if_not_exists=True)
+    if op.get_bind().dialect.name == "postgresql":
+        # lower(name) LIKE 'prefix%' can only use a btree with pattern ops outside the C collation
+        op.create_index(
+            "ix_characters_name_lower_pattern",
+            "characters",
+            [sa.text("lower(name) text_pattern_ops")],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_characters_name_lower_pattern", table_name="characters")
+    for name in {**EQUALITY_INDEXES, **RANGE_INDEXES}:
+        op.drop_index(name, table_name="characters")
@@ -0,0 +1,41 @@
+"""Trigram indexes for fuzzy search
+
+Revision ID: 005_trigram_search
+Revises: 004_list_filters
+Create Date: 2026-10-18 17:21:48.310562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_trigram_search'
+down_revision: Union[str, None] = '004_list_filters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = {
+    "ix_characters_name_trgm": "lower(name) gin_trgm_ops",
+    "ix_characters_other_aliases_trgm": "lower(other_aliases) gin_trgm_ops",
+}
+
+
+def upgrade() -> None:
+    # GET /characters/search uses pg_trgm on PostgreSQL; other databases search an in-memory index
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, expression in TRIGRAM_INDEXES.items():
+        op.create_index(
+            name, "characters", [sa.text(expression)], postgresql_using="gin", if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name="characters")
@@ -1,14 +1,119 @@
 """FastAPI dependencies."""
-from functools import lru_cache
+import inspect
+import secrets
+import time
+from typing import Optional
+
+from fastapi import Header, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import configdb
+from app.config import ADMIN_TOKEN, DATABASE_ASYNC
+from app.metrics import DB_SESSION_SECONDS, DB_SESSIONS
+from app.services.async_character_service import AsyncCharacterService
+from app.services.character_service import CharacterService
+
+
+class LazySession:
+    """Stand-in for a request session that only creates it on first use.
+
+    Requests answered without the database (cache hits, validation errors, 304s)
+    never build a session. Every attribute is forwarded to the real session.
+    """
+
+    __slots__ = ("_factory", "_mode", "_session", "_started")
+
+    def __init__(self, factory, mode: str):
+        self._factory = factory
+        self._mode = mode
+        self._session = None
+        self._started = None
+
+    def __getattr__(self, name):
+        if self._session is None:
+            self._session = self._factory()
+            self._started = time.perf_counter()
+        return getattr(self._session, name)
+
+    def _observe(self) -> None:
+        DB_SESSIONS.labels(mode=self._mode, used=str(self._session is not None).lower()).inc()
+        if self._session is not None:
+            DB_SESSION_SECONDS.labels(mode=self._mode).observe(time.perf_counter() - self._started)
 
-from app.configdb import get_db
+    def release(self) -> None:
+        """Close the sync session, if one was created."""
+        try:
+            if self._session is not None:
+                self._session.close()
+        finally:
+            self._observe()
 
+    async def arelease(self) -> None:
+        """Close the async session, if one was created."""
+        try:
+            if self._session is not None:
+                await self._session.close()
+        finally:
+            self._observe()
 
-def get_db_session() -> Session:
-    """Get database session dependency."""
-    db = next(get_db())
+
+def get_sync_db_session() -> Session:
+    """Get sync database session dependency."""
+    db = LazySession(configdb.SessionLocal, "default")
+    try:
+        yield db
+    finally:
+        db.release()
+
+
+def get_sync_read_db_session() -> Session:
+    """Get sync database session dependency for read-only routes."""
+    db = LazySession(configdb.ReadSessionLocal, "read")
     try:
         yield db
     finally:
-        db.close()
+        db.release()
+
+
+async def get_async_db_session():
+    """Get async database session dependency."""
+    db = LazySession(configdb.AsyncSessionLocal, "default")
+    try:
+        yield db
+    finally:
+        await db.arelease()
+
+
+async def get_async_read_db_session():
+    """Get async database session dependency for read-only routes."""
+    db = LazySession(configdb.AsyncReadSessionLocal, "read")
+    try:
+        yield db
+    finally:
+        await db.arelease()
+
+
+# Session and service implementations are selected once, by DATABASE_ASYNC
+get_db_session = get_async_db_session if DATABASE_ASYNC else get_sync_db_session
+get_read_db_session = get_async_read_db_session if DATABASE_ASYNC else get_sync_read_db_session
+
+
+def get_character_service():
+    """Get the character service matching the configured session type."""
+    return AsyncCharacterService if DATABASE_ASYNC else CharacterService
+
+
+async def call_service(method, *args, **kwargs):
+    """Await an async service method, or run a sync one off the event loop."""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await run_in_threadpool(method, *args, **kwargs)
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Guard of the /admin routes: hidden without ADMIN_TOKEN, 403 without the matching header."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
@@ -0,0 +1,41 @@
+"""Strong ETags derived from row versions, and If-None-Match handling."""
+import hashlib
+from typing import Iterable, Optional, Sequence
+
+from fastapi import Response
+
+# Bump when the JSON representation of a character changes, to invalidate every client copy
+REPRESENTATION_VERSION = "1"
+
+
+def character_etag(character_id: int, version: int) -> str:
+    """ETag of a single character."""
+    return f'"{REPRESENTATION_VERSION}-{character_id}-{version}"'
+
+
+def page_etag(keys: Iterable, has_more: bool = False) -> str:
+    """ETag of a list page, from the (id, version) of its rows."""
+    digest = hashlib.sha1(REPRESENTATION_VERSION.encode())
+    for character_id, version in keys:
+        digest.update(f"{character_id}:{version},".encode())
+    digest.update(b"+" if has_more else b".")
+    return f'"{digest.hexdigest()}"'
+
+
+def projected_etag(etag: str, fields: Optional[Sequence[str]]) -> str:
+    """ETag of a fields= projection: each field set is a different representation."""
+    if fields is None:
+        return etag
+    return f'{etag[:-1]}-{"+".join(fields)}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of If-None-Match against the current ETag (RFC 9110)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,30 @@
+"""Query parameters of the list filters."""
+from typing import Dict, Optional
+
+from fastapi import Query
+
+
+def list_filters(
+    universe: Optional[str] = Query(None, description="Exact universe"),
+    identity: Optional[str] = Query(None, description="Exact identity"),
+    education: Optional[str] = Query(None, description="Exact education"),
+    other_aliases: Optional[str] = Query(None, description="Exact other aliases"),
+    min_height: Optional[float] = Query(None, ge=0, description="Minimum height, inclusive"),
+    max_height: Optional[float] = Query(None, ge=0, description="Maximum height, inclusive"),
+    min_weight: Optional[float] = Query(None, ge=0, description="Minimum weight, inclusive"),
+    max_weight: Optional[float] = Query(None, ge=0, description="Maximum weight, inclusive"),
+    name_prefix: Optional[str] = Query(None, min_length=1, description="Case-insensitive name prefix"),
+) -> Dict[str, object]:
+    """Collect the filters that were given, keyed on the parameter name."""
+    filters = {
+        "universe": universe,
+        "identity": identity,
+        "education": education,
+        "other_aliases": other_aliases,
+        "min_height": min_height,
+        "max_height": max_height,
+        "min_weight": min_weight,
+        "max_weight": max_weight,
+        "name_prefix": name_prefix,
+    }
+    return {key: value for key, value in filters.items() if value is not None}
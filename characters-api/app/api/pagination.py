@@ -0,0 +1,26 @@
+"""Opaque cursors for keyset pagination."""
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the key of the last row on a page into an opaque cursor."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor back into the id to continue after; an empty cursor starts from the beginning."""
+    if not cursor:
+        return 0
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
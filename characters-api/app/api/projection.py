@@ -0,0 +1,24 @@
+"""The fields= query parameter: which response columns to select and return."""
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.services.character_service import RESPONSE_FIELDS
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse "name,universe" into response fields, in response order; None means every field."""
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(RESPONSE_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    if not requested:
+        raise HTTPException(status_code=400, detail=f"fields must name at least one of: {', '.join(RESPONSE_FIELDS)}")
+    return tuple(field for field in RESPONSE_FIELDS if field in requested)
+
+
+def project(payload: dict, fields: Tuple[str, ...]) -> dict:
+    """Trim a full CharacterResponse dict to the requested fields."""
+    return {field: payload[field] for field in fields}
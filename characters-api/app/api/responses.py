@@ -0,0 +1,22 @@
+"""Pre-encoded JSON responses that skip response_model validation and jsonable_encoder."""
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode to compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def json_response(content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Build a JSON Response from content that already has its final shape."""
+    return Response(content=dumps(content), media_type="application/json", headers=headers)
@@ -0,0 +1,45 @@
+"""Admin routes: profiles recorded by the in-process profiler, guarded by ADMIN_TOKEN."""
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.api.dependencies import require_admin_token
+from app.config import PROFILING_ENABLED
+from app.profiling import profiler, render
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/profiles")
+async def list_profiles() -> Dict[str, object]:
+    """Profiles in the ring buffer, newest first."""
+    return {
+        "enabled": PROFILING_ENABLED,
+        "result": [profile.summary() for profile in reversed(profiler.profiles)],
+    }
+
+
+@router.get("/profiles/collapsed", response_class=PlainTextResponse)
+async def collapsed_profiles(
+    route: Optional[str] = Query(None, description="Route template, e.g. /character"),
+) -> str:
+    """Collapsed stacks of every kept profile (of one route template, if given), summed."""
+    profiles = [profile for profile in profiler.profiles if route is None or profile.route == route]
+    return render(profiler.merged(profiles))
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: int) -> str:
+    """Collapsed stacks of one profile, for flamegraph.pl or speedscope."""
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return render(profile.stacks)
+
+
+@router.delete("/profiles")
+async def clear_profiles() -> Dict[str, str]:
+    """Drop every kept profile."""
+    profiler.clear()
+    return {"message": "Profiles cleared"}
@@ -1,47 +1,237 @@
 """Character API routes."""
-from typing import Dict, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from collections import Counter
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app.api.dependencies import get_db_session
-from app.services.character_service import CharacterService
-from app.schemas import CharacterResponse, CharacterCreate
+from app.api.dependencies import call_service, get_character_service, get_db_session, get_read_db_session
+from app.cache import MISSING
+from app.config import DATABASE_ASYNC, FAST_JSON_RESPONSES
+from app.api.etag import character_etag, etag_matches, not_modified, page_etag, projected_etag
+from app.api.filters import list_filters
+from app.api.pagination import decode_cursor, encode_cursor
+from app.api.projection import parse_fields, project
+from app.api.responses import json_response
+from app.schemas import (
+    BatchGetRequest,
+    BatchGetResponse,
+    BulkDeleteRequest,
+    BulkDeleteResponse,
+    BulkItemResult,
+    BulkWriteResponse,
+    CharacterCreate,
+    CharacterListResponse,
+    CharacterResponse,
+    CharacterSearchResponse,
+)
+from app.services.character_export import MEDIA_TYPES, aiter_export, iter_export
+from app.services import character_cache, character_search
+from app.services.character_service import (
+    BULK_CONFLICT,
+    BULK_FAILED,
+    BULK_FAILED_MSG,
+    BULK_INVALID,
+    CHARACTER_NOT_FOUND_MSG,
+    RESPONSE_FIELDS,
+)
 
 router = APIRouter()
 
 # Constants
 DATABASE_ERROR_MSG = "Database error"
+BULK_MAX_ITEMS = 5000
+SEARCH_MAX_RESULTS = 100
+BATCH_GET_MAX_NAMES = 1000
 
 
-@router.get("/", response_model=Dict[str, List[CharacterResponse]])
+def _page_response(rows, has_more: bool, keyset: bool, fields: Optional[Tuple[str, ...]] = None) -> Response:
+    """Encode (id, version, *fields) rows into the CharacterListResponse JSON, trimmed to fields."""
+    keys = fields or RESPONSE_FIELDS
+    content = {"result": [dict(zip(keys, row[2:])) for row in rows]}
+    if keyset:
+        content["next_cursor"] = encode_cursor(rows[-1].id) if has_more else None
+    etag = projected_etag(page_etag(((row.id, row.version) for row in rows), has_more=has_more), fields)
+    return json_response(content, headers={"ETag": etag})
+
+
+@router.get("/characters", response_model=CharacterListResponse, response_model_exclude_unset=True)
 async def get_all_characters(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    db: Session = Depends(get_db_session)
+    cursor: Optional[str] = Query(
+        None, description="Cursor from next_cursor; pass an empty value to start cursor pagination"
+    ),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,universe"),
+    filters: Dict[str, object] = Depends(list_filters),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db_session),
+    service=Depends(get_character_service)
+):
+    """Get a list of characters matching the filters, with offset or cursor pagination."""
+    after_id = decode_cursor(cursor) if cursor is not None else None
+    fields = parse_fields(fields)
+    # Keyset mode reads one extra row to tell whether there is a next page
+    fetch_limit = limit + 1 if after_id is not None else limit
+
+    if if_none_match:
+        # Compare against the (id, version) keys of the page before loading any full row
+        keys = await call_service(
+            service.get_page_versions, db, skip=skip, limit=fetch_limit, after_id=after_id, filters=filters
+        )
+        etag = projected_etag(page_etag(keys[:limit], has_more=len(keys) > limit), fields)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    if FAST_JSON_RESPONSES or fields is not None:
+        # Projections select only the requested columns and bypass response_model
+        rows = await call_service(
+            service.get_page_rows, db, skip=skip, limit=fetch_limit, after_id=after_id, fields=fields,
+            filters=filters
+        )
+        has_more = after_id is not None and len(rows) > limit
+        return _page_response(rows[:limit], has_more=has_more, keyset=after_id is not None, fields=fields)
+
+    if after_id is None:
+        characters = await call_service(service.get_all_characters, db, skip=skip, limit=limit, filters=filters)
+        response.headers["ETag"] = page_etag((character.id, character.version) for character in characters)
+        return {"result": characters}
+
+    characters = await call_service(
+        service.get_characters_after, db, after_id=after_id, limit=fetch_limit, filters=filters
+    )
+    has_more = len(characters) > limit
+    characters = characters[:limit]
+    response.headers["ETag"] = page_etag(
+        ((character.id, character.version) for character in characters), has_more=has_more
+    )
+    next_cursor = encode_cursor(characters[-1].id) if has_more else None
+    return {"result": characters, "next_cursor": next_cursor}
+
+
+@router.get("/characters/export")
+async def export_characters(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="Export format"),
 ):
-    """Get a list of all characters with pagination."""
-    characters = CharacterService.get_all_characters(db, skip=skip, limit=limit)
-    return {"result": characters}
+    """Stream every character as NDJSON or CSV with bounded memory."""
+    iter_rows = aiter_export if DATABASE_ASYNC else iter_export
+    return StreamingResponse(
+        iter_rows(export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="characters.{export_format}"'},
+    )
+
+
+@router.get("/characters/search", response_model=CharacterSearchResponse)
+async def search_characters(
+    q: str = Query(..., min_length=1, max_length=100, description="Name or alias to look for; typos are tolerated"),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_RESULTS, description="Maximum number of results"),
+    db: Session = Depends(get_db_session),
+    service=Depends(get_character_service)
+):
+    """Fuzzy search on name and other aliases, best matches first."""
+    results = await call_service(service.search_characters, q, db, limit=limit)
+    return {"result": results}
 
 
 @router.get("/character", response_model=Dict[str, CharacterResponse])
 async def get_character_by_name(
     name: str,
-    db: Session = Depends(get_db_session)
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,universe"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db_session),
+    service=Depends(get_character_service)
 ):
-    """Get a character by name."""
-    character = CharacterService.get_character_by_name(name, db)
-    return {"result": character}
+    """Get a character by name, served from the cache when possible."""
+    fields = parse_fields(fields)
+    cached = await character_cache.get(name)
+    if cached is character_cache.NOT_FOUND:
+        raise HTTPException(status_code=400, detail=CHARACTER_NOT_FOUND_MSG)
+    if cached is not MISSING:
+        etag = projected_etag(cached["etag"], fields)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        if fields is not None:
+            return json_response({"result": project(cached["result"], fields)}, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return {"result": cached["result"]}
+
+    if if_none_match:
+        # Only the id and version are needed to answer 304
+        current = await call_service(service.get_character_version, name, db)
+        if current is not None:
+            etag = projected_etag(character_etag(current.id, current.version), fields)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    try:
+        if fields is not None:
+            # Load only the requested columns; partial rows are not cached
+            character = await call_service(service.get_character_fields, name, db, fields)
+            etag = projected_etag(character_etag(character.id, character.version), fields)
+            return json_response({"result": dict(zip(fields, character[2:]))}, headers={"ETag": etag})
+        character = await call_service(service.get_character_by_name, name, db)
+    except HTTPException as e:
+        if e.status_code == 400:
+            await character_cache.store_not_found(name)
+        raise
+    entry = await character_cache.store(name, character)
+    response.headers["ETag"] = entry["etag"]
+    return {"result": entry["result"]}
+
+
+@router.post("/characters/batch-get", response_model=BatchGetResponse)
+async def batch_get_characters(
+    request: BatchGetRequest,
+    db: Session = Depends(get_read_db_session),
+    service=Depends(get_character_service)
+):
+    """Get many characters by name in one round trip: cached ones from the cache, the rest in one query."""
+    if len(request.names) > BATCH_GET_MAX_NAMES:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_GET_MAX_NAMES} names per request")
+
+    # Names are case-insensitive: each one is looked up once, as first spelled
+    names, seen = [], set()
+    for name in request.names:
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+
+    # Lowercased name -> payload, or NOT_FOUND
+    payloads, uncached = {}, []
+    cached_entries = await character_cache.get_many(names)
+    for name in names:
+        cached = cached_entries[name.lower()]
+        if cached is MISSING:
+            uncached.append(name)
+        else:
+            payloads[name.lower()] = cached if cached is character_cache.NOT_FOUND else cached["result"]
+
+    if uncached:
+        characters = await call_service(service.get_characters_by_names, uncached, db)
+        entries = await character_cache.store_many(characters)
+        payloads.update((key, entry["result"]) for key, entry in entries.items())
+        await character_cache.store_not_found(*(name for name in uncached if name.lower() not in payloads))
+
+    result = [payloads[name.lower()] for name in names if payloads.get(name.lower()) is not None]
+    missing = [name for name in names if payloads.get(name.lower()) is None]
+    return {"result": result, "missing": missing}
 
 
 @router.post("/character", status_code=200, response_model=Dict[str, CharacterResponse])
 async def create_character(
     character_data: CharacterCreate,
-    db: Session = Depends(get_db_session)
+    db: Session = Depends(get_db_session),
+    service=Depends(get_character_service)
 ):
     """Create a new character."""
     try:
-        new_character = CharacterService.create_character(character_data.dict(), db)
+        new_character = await call_service(service.create_character, character_data.dict(), db)
+        await character_cache.invalidate(new_character.name)
+        character_search.invalidate()
         return {"result": new_character}
     except HTTPException:
         raise
@@ -52,14 +242,96 @@ async def create_character(
         raise HTTPException(status_code=500, detail=DATABASE_ERROR_MSG)
 
 
+@router.post("/characters/bulk", response_model=BulkWriteResponse)
+async def bulk_upsert_characters(
+    items: List[Any] = Body(..., description="Characters in the CharacterCreate format"),
+    on_conflict: Literal["update", "skip"] = Query(
+        "update", description="Update existing characters or report them as conflicts"
+    ),
+    db: Session = Depends(get_db_session),
+    service=Depends(get_character_service)
+):
+    """Create or update many characters; every item gets its own status and the batch is never aborted."""
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} characters per request")
+
+    results = [None] * len(items)
+    valid_indexes, valid_characters, seen_names = [], [], set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = BulkItemResult(
+                index=index, status=BULK_INVALID, detail="Each character must be a JSON object"
+            )
+            continue
+        try:
+            character = CharacterCreate(**item).dict()
+        except ValidationError as e:
+            results[index] = BulkItemResult(
+                index=index, name=item.get("name"), status=BULK_INVALID, detail=e.errors()
+            )
+            continue
+        if character["name"].lower() in seen_names:
+            results[index] = BulkItemResult(
+                index=index, name=character["name"], status=BULK_CONFLICT, detail="Duplicate name in batch"
+            )
+            continue
+        seen_names.add(character["name"].lower())
+        valid_indexes.append(index)
+        valid_characters.append(character)
+
+    if valid_characters:
+        statuses = await call_service(
+            service.bulk_upsert_characters, valid_characters, db, update_existing=on_conflict == "update"
+        )
+        await character_cache.invalidate(*(character["name"] for character in valid_characters))
+        character_search.invalidate()
+        for index, character, status in zip(valid_indexes, valid_characters, statuses):
+            detail = BULK_FAILED_MSG if status == BULK_FAILED else None
+            results[index] = BulkItemResult(index=index, name=character["name"], status=status, detail=detail)
+
+    return {"result": results, "summary": Counter(result.status for result in results)}
+
+
+@router.post("/characters/bulk-delete", response_model=BulkDeleteResponse)
+async def bulk_delete_characters(
+    request: BulkDeleteRequest,
+    db: Session = Depends(get_db_session),
+    service=Depends(get_character_service)
+):
+    """Delete characters by names or by list filters in one statement, capped at max_rows."""
+    filters = request.dict(exclude={"names", "dry_run", "max_rows"}, exclude_none=True)
+    if (request.names is None) == (not filters):
+        raise HTTPException(status_code=400, detail="Give either names or at least one filter")
+    if request.names is not None and len(request.names) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} names per request")
+    if request.names is not None and not request.names:
+        return {"matched": 0, "deleted": [], "dry_run": request.dry_run}
+
+    matched, deleted = await call_service(
+        service.bulk_delete_characters,
+        db,
+        names=request.names,
+        filters=filters,
+        max_rows=request.max_rows,
+        dry_run=request.dry_run,
+    )
+    if deleted:
+        await character_cache.invalidate(*deleted)
+        character_search.invalidate()
+    return {"matched": matched, "deleted": deleted, "dry_run": request.dry_run}
+
+
 @router.put("/character", response_model=Dict[str, CharacterResponse])
 async def update_character(
     character_data: CharacterCreate,
-    db: Session = Depends(get_db_session)
+    db: Session = Depends(get_db_session),
+    service=Depends(get_character_service)
 ):
     """Update an existing character."""
     try:
-        character = CharacterService.update_character(character_data.dict(), db)
+        character = await call_service(service.update_character, character_data.dict(), db)
+        await character_cache.invalidate(character_data.name)
+        character_search.invalidate()
         return {"result": character}
     except HTTPException:
         raise
@@ -73,11 +345,14 @@ async def update_character(
 @router.delete("/character")
 async def delete_character(
     name: str,
-    db: Session = Depends(get_db_session)
+    db: Session = Depends(get_db_session),
+    service=Depends(get_character_service)
 ):
     """Delete a character by name."""
     try:
-        message = CharacterService.delete_character(name, db)
+        message = await call_service(service.delete_character, name, db)
+        await character_cache.invalidate(name)
+        character_search.invalidate()
         return {"message": message}
     except HTTPException:
         raise
@@ -3,8 +3,7 @@ from typing import Dict
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.api.dependencies import get_db_session
-from app.services.character_service import CharacterService
+from app.api.dependencies import call_service, get_character_service, get_read_db_session
 
 router = APIRouter()
 
@@ -16,9 +15,9 @@ async def read_root():
 
 
 @router.get("/test-db")
-async def test_db(db: Session = Depends(get_db_session)):
+async def test_db(db: Session = Depends(get_read_db_session), service=Depends(get_character_service)):
     """Test database connection."""
-    is_connected = CharacterService.check_db_connection(db)
+    is_connected = await call_service(service.check_db_connection, db)
 
     if is_connected:
         return {"status": "Database connection successful"}
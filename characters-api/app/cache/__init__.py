@@ -0,0 +1,36 @@
+"""Cache backends: in-process LRU, or a shared Redis-protocol server for multi-replica deployments."""
+from app.cache.base import MISSING, CacheBackend
+from app.cache.memory import LRUCache
+from app.cache.redis_backend import RedisCacheBackend
+from app.config import (
+    CACHE_BACKEND,
+    CACHE_INVALIDATION_CHANNEL,
+    CACHE_LOCAL_TTL_SECONDS,
+    CACHE_MAX_ENTRIES,
+    CACHE_REDIS_PREFIX,
+    CACHE_REDIS_TIMEOUT_SECONDS,
+    CACHE_REDIS_URL,
+    CACHE_TTL_SECONDS,
+)
+
+__all__ = ["MISSING", "CacheBackend", "LRUCache", "RedisCacheBackend", "build_cache"]
+
+
+def build_cache(name: str) -> CacheBackend:
+    """Create the backend selected by CACHE_BACKEND."""
+    if CACHE_BACKEND == "memory":
+        return LRUCache(name, CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+    if CACHE_BACKEND == "redis":
+        local = None
+        if CACHE_LOCAL_TTL_SECONDS > 0:
+            local = LRUCache(f"{name}_local", CACHE_MAX_ENTRIES, CACHE_LOCAL_TTL_SECONDS)
+        return RedisCacheBackend.from_url(
+            CACHE_REDIS_URL,
+            timeout_seconds=CACHE_REDIS_TIMEOUT_SECONDS,
+            name=name,
+            ttl_seconds=CACHE_TTL_SECONDS,
+            prefix=CACHE_REDIS_PREFIX,
+            channel=CACHE_INVALIDATION_CHANNEL,
+            local=local,
+        )
+    raise ValueError(f"Unknown CACHE_BACKEND '{CACHE_BACKEND}', expected 'memory' or 'redis'")
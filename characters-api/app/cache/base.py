@@ -0,0 +1,36 @@
+"""Cache backend interface."""
+from typing import Any, Hashable, Optional
+
+# Returned by CacheBackend.get when the key is absent, expired or the cache is unavailable
+MISSING = object()
+
+
+class CacheBackend:
+    """Key/value cache with per-entry TTL. Values must be JSON-serializable for shared backends."""
+
+    # True when calls wait on the network and must not run on the event loop
+    blocking = False
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING."""
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """Store a value only if the key holds neither a value nor a tombstone; return whether it was stored."""
+        raise NotImplementedError
+
+    def delete(self, *keys: Hashable) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, *keys: Hashable, hold_seconds: float = 0) -> None:
+        """Replace the entries with tombstones for hold_seconds: get() misses and add() is refused until they expire."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release connections and background threads."""
@@ -0,0 +1,81 @@
+"""Bounded in-process LRU cache with per-entry TTL."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.cache.base import MISSING, CacheBackend
+from app.metrics import CACHE_ENTRIES, CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES
+
+# Held by invalidated keys until their hold expires
+_TOMBSTONE = object()
+
+
+class LRUCache(CacheBackend):
+    """Thread-safe LRU cache; entries expire after their TTL and are reported to Prometheus under `name`."""
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        CACHE_ENTRIES.labels(cache=name).set_function(self.__len__)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at <= time.monotonic():
+                    del self._entries[key]
+                    CACHE_EVICTIONS.labels(cache=self.name, reason="expired").inc()
+                elif value is not _TOMBSTONE:
+                    self._entries.move_to_end(key)
+                    CACHE_HITS.labels(cache=self.name).inc()
+                    return value
+        CACHE_MISSES.labels(cache=self.name).inc()
+        return MISSING
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries beyond max_entries."""
+        with self._lock:
+            self._insert(key, value, self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+
+    def add(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """Store a value unless the key already holds an unexpired value or tombstone."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return False
+            self._insert(key, value, self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        return True
+
+    def _insert(self, key: Hashable, value: Any, ttl_seconds: float) -> None:
+        """Store under the lock, evicting the least recently used entries beyond max_entries."""
+        self._entries[key] = (value, time.monotonic() + ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            CACHE_EVICTIONS.labels(cache=self.name, reason="capacity").inc()
+
+    def delete(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def invalidate(self, *keys: Hashable, hold_seconds: float = 0) -> None:
+        if hold_seconds <= 0:
+            self.delete(*keys)
+            return
+        with self._lock:
+            for key in keys:
+                self._insert(key, _TOMBSTONE, hold_seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
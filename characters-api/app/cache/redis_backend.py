@@ -0,0 +1,190 @@
+"""Shared cache backend for any Redis-protocol server, with cross-replica invalidation over pub/sub.
+
+Every replica keeps a small local LRU in front of the shared store. Deletes are
+published on a channel, and a subscriber thread in each replica evicts the
+published keys from its local LRU, so invalidations reach all replicas at once.
+
+Invalidated keys hold a tombstone for a short while instead of being deleted,
+and read-through stores use SET NX, so a read that loaded a row before a write
+cannot put it back in the cache after the write invalidated it.
+
+Any error talking to the server is logged and counted, and the lookup is
+reported as a miss, so callers fall back to the database.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+from app.cache.base import MISSING, CacheBackend
+from app.cache.memory import LRUCache
+from app.metrics import CACHE_ERRORS, CACHE_HITS, CACHE_MISSES
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds between reconnection attempts of the invalidation subscriber
+RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+# Stored in place of invalidated keys; never valid JSON, so it cannot collide with a cached value
+TOMBSTONE = b"\x00invalidated"
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache entries in a Redis-protocol server, fronted by an optional local LRU."""
+
+    blocking = True
+
+    def __init__(
+        self,
+        name: str,
+        client,
+        ttl_seconds: float,
+        prefix: str = "characters:",
+        channel: str = "characters:invalidate",
+        local: Optional[LRUCache] = None,
+    ):
+        self.name = name
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.channel = channel
+        self.local = local
+        self._closed = threading.Event()
+        self._subscriber = None
+        if local is not None:
+            self._subscriber = threading.Thread(
+                target=self._listen_for_invalidations, name=f"{name}-cache-invalidation", daemon=True
+            )
+            self._subscriber.start()
+
+    @classmethod
+    def from_url(cls, url: str, timeout_seconds: float, **kwargs) -> "RedisCacheBackend":
+        """Connect with short timeouts: a slow cache must not hold up the request more than the database would."""
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        client = redis.Redis.from_url(
+            url, socket_timeout=timeout_seconds, socket_connect_timeout=timeout_seconds
+        )
+        return cls(client=client, **kwargs)
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}{key}"
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        CACHE_ERRORS.labels(cache=self.name, operation=operation).inc()
+        logger.warning(f"Cache {operation} failed, falling back to the database: {error}")
+
+    def get(self, key: Hashable) -> Any:
+        if self.local is not None:
+            value = self.local.get(key)
+            if value is not MISSING:
+                return value
+        try:
+            raw = self.client.get(self._key(key))
+        except Exception as e:
+            self._failed("get", e)
+            return MISSING
+        if raw is None or raw == TOMBSTONE:
+            CACHE_MISSES.labels(cache=self.name).inc()
+            return MISSING
+        CACHE_HITS.labels(cache=self.name).inc()
+        value = json.loads(raw)
+        if self.local is not None:
+            self.local.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        try:
+            self.client.set(self._key(key), json.dumps(value), px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            self._failed("set", e)
+            return
+        if self.local is not None:
+            self.local.set(key, value, ttl_seconds=min(ttl, self.local.ttl_seconds))
+
+    def add(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        try:
+            stored = self.client.set(self._key(key), json.dumps(value), px=max(1, int(ttl * 1000)), nx=True)
+        except Exception as e:
+            self._failed("set", e)
+            return False
+        if stored and self.local is not None:
+            self.local.set(key, value, ttl_seconds=min(ttl, self.local.ttl_seconds))
+        return bool(stored)
+
+    def delete(self, *keys: Hashable) -> None:
+        self.invalidate(*keys)
+
+    def invalidate(self, *keys: Hashable, hold_seconds: float = 0) -> None:
+        if not keys:
+            return
+        if self.local is not None:
+            self.local.delete(*keys)
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            if hold_seconds > 0:
+                for key in keys:
+                    pipeline.set(self._key(key), TOMBSTONE, px=max(1, int(hold_seconds * 1000)))
+            else:
+                pipeline.delete(*(self._key(key) for key in keys))
+            pipeline.publish(self.channel, json.dumps(list(keys)))
+            pipeline.execute()
+        except Exception as e:
+            self._failed("delete", e)
+
+    def clear(self) -> None:
+        if self.local is not None:
+            self.local.clear()
+        try:
+            keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+            if keys:
+                self.client.delete(*keys)
+            self.client.publish(self.channel, json.dumps(None))
+        except Exception as e:
+            self._failed("clear", e)
+
+    def close(self) -> None:
+        self._closed.set()
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+    def _listen_for_invalidations(self) -> None:
+        """Evict keys published by any replica from the local LRU; resubscribe after connection errors."""
+        while not self._closed.is_set():
+            pubsub = None
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Invalidations published while disconnected are lost
+                self.local.clear()
+                while not self._closed.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    keys = json.loads(message["data"])
+                    if keys is None:
+                        self.local.clear()
+                    else:
+                        self.local.delete(*keys)
+            except Exception as e:
+                if self._closed.is_set():
+                    break
+                self._failed("subscribe", e)
+                self.local.clear()
+                time.sleep(RESUBSCRIBE_DELAY_SECONDS)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
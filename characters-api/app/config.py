@@ -5,9 +5,96 @@ import os
 # Load environment variables from .env file
 load_dotenv()
 
+
+def _get_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _get_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return default if value is None or value.strip() == "" else int(value)
+
+
+def _get_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return default if value is None or value.strip() == "" else float(value)
+
+
 # Get database URL from environment variables
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Optional comma-separated read replica URLs: reads are spread over them in round-robin
+# order, writes (and the reads that follow them in the same request) go to DATABASE_URL
+DATABASE_READ_URLS = [url.strip() for url in os.getenv("DATABASE_READ_URLS", "").split(",") if url.strip()]
+
+# Use SQLAlchemy AsyncSession (asyncpg / aiosqlite) instead of the sync Session
+DATABASE_ASYNC = _get_bool("DATABASE_ASYNC")
+# Optional explicit async URL; derived from DATABASE_URL when not set
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Connection pool of every engine (per process): pool_size connections are kept open,
+# up to max_overflow more are opened under load, and a checkout waits at most
+# DB_POOL_TIMEOUT seconds. Connections are replaced after DB_POOL_RECYCLE seconds
+# (-1: never) and tested before use when DB_POOL_PRE_PING is on.
+DB_POOL_SIZE = _get_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _get_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _get_float("DB_POOL_TIMEOUT", 30.0)
+DB_POOL_RECYCLE = _get_int("DB_POOL_RECYCLE", 1800)
+DB_POOL_PRE_PING = _get_bool("DB_POOL_PRE_PING", True)
+
+# Run the SELECTs of read-only routes in autocommit mode: no BEGIN/COMMIT round trips and
+# no connection left idle in transaction while the response is being built
+DB_AUTOCOMMIT_READS = _get_bool("DB_AUTOCOMMIT_READS")
+
+# Create missing tables at startup (Base.metadata.create_all) for throwaway databases;
+# otherwise the schema comes from `alembic upgrade head` and startup does not touch the database
+AUTO_CREATE_SCHEMA = _get_bool("AUTO_CREATE_SCHEMA")
+
+# In-process cache of GET /character payloads, keyed on the lowercased name
+CACHE_ENABLED = _get_bool("CACHE_ENABLED", True)
+CACHE_MAX_ENTRIES = _get_int("CACHE_MAX_ENTRIES", 2048)
+CACHE_TTL_SECONDS = _get_float("CACHE_TTL_SECONDS", 60.0)
+# Unknown names are cached for this long; 0 disables negative caching
+CACHE_NEGATIVE_TTL_SECONDS = _get_float("CACHE_NEGATIVE_TTL_SECONDS", 0.0)
+# After a write the name is not cached again for this long, so that a read which started before
+# the write, or ran on a lagging replica, cannot cache the old row
+CACHE_INVALIDATION_HOLD_SECONDS = _get_float("CACHE_INVALIDATION_HOLD_SECONDS", 2.0)
+# "memory" (per process) or "redis" (shared by all replicas, any Redis-protocol server)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_REDIS_PREFIX = os.getenv("CACHE_REDIS_PREFIX", "characters:")
+CACHE_REDIS_TIMEOUT_SECONDS = _get_float("CACHE_REDIS_TIMEOUT_SECONDS", 0.05)
+# Pub/sub channel used to evict local copies on every replica after a write
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "characters:invalidate")
+# Lifetime of the per-replica copy in front of the shared cache; 0 disables it
+CACHE_LOCAL_TTL_SECONDS = _get_float("CACHE_LOCAL_TTL_SECONDS", 5.0)
+
+# Encode list pages straight from column tuples (orjson when installed) instead of
+# validating every row through CharacterResponse; the JSON shape is the same
+FAST_JSON_RESPONSES = _get_bool("FAST_JSON_RESPONSES")
+
+# GET /characters/search: time budget of one search on PostgreSQL, minimum trigram score of a
+# result, and how long the in-memory n-gram index (SQLite/local) may lag writes of other processes
+SEARCH_TIMEOUT_MS = _get_int("SEARCH_TIMEOUT_MS", 250)
+SEARCH_MIN_SCORE = _get_float("SEARCH_MIN_SCORE", 0.3)
+SEARCH_INDEX_TTL_SECONDS = _get_float("SEARCH_INDEX_TTL_SECONDS", 60.0)
+
+# Shared secret of the /admin routes (X-Admin-Token header); the routes answer 404 when unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# In-process stack-sampling profiler: profile PROFILING_SAMPLE_RATE of the requests, and keep
+# the profile of any request slower than PROFILING_SLOW_MS (0: off). Stacks are sampled every
+# PROFILING_INTERVAL_MS and the last PROFILING_MAX_PROFILES profiles are served on /admin/profiles
+PROFILING_ENABLED = _get_bool("PROFILING_ENABLED")
+PROFILING_SAMPLE_RATE = _get_float("PROFILING_SAMPLE_RATE", 0.01)
+PROFILING_SLOW_MS = _get_float("PROFILING_SLOW_MS", 0.0)
+PROFILING_INTERVAL_MS = _get_float("PROFILING_INTERVAL_MS", 5.0)
+PROFILING_MAX_PROFILES = _get_int("PROFILING_MAX_PROFILES", 50)
+
+
 def setup_logging():
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
@@ -1,19 +1,193 @@
+import threading
+from itertools import cycle
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
-from app.config import DATABASE_URL
+from app.config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_ASYNC,
+    DATABASE_READ_URLS,
+    DATABASE_URL,
+    DB_AUTOCOMMIT_READS,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+)
+from app.db_pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from app.db_routing import RoutingSession
+from app.db_timing import instrument
 from app.model import Base
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async drivers for the sync dialects we run on
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Engines and session factories, created on first use instead of at import so that
+# importing the app neither connects to the database nor shares pools across forked workers
+RESOURCE_NAMES = (
+    "engine",
+    "read_engines",
+    "SessionLocal",
+    "ReadSessionLocal",
+    "async_engine",
+    "async_read_engines",
+    "AsyncSessionLocal",
+    "AsyncReadSessionLocal",
+)
+_resources = {}
+_lock = threading.Lock()
+
+
+def pool_options(url: str, name: str, asynchronous: bool = False) -> dict:
+    """Pool settings from app.config, with an instrumented pool labelled `name` in the metrics."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite lives in a single connection: keep SQLAlchemy's default pool
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if asynchronous else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def autocommit(engine):
+    """The same engine and pool, with every statement committed on its own (no BEGIN)."""
+    return engine.execution_options(isolation_level="AUTOCOMMIT")
+
+
+def make_sessionmaker(primary, replicas: list):
+    """Sessions on the primary, routed to the replicas for reads when there are any."""
+    if replicas:
+        return sessionmaker(
+            class_=RoutingSession, primary=primary, replicas=cycle(replicas), autocommit=False, autoflush=False
+        )
+    return sessionmaker(autocommit=False, autoflush=False, bind=primary)
+
+
+def get_async_database_url(url: str) -> str:
+    """Translate a sync database URL into its async driver equivalent."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def create_engines() -> dict:
+    """Build the engines and session factories. No connection is opened until a session needs one."""
+    engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL, "primary"))
+    read_engines = [
+        create_engine(url, **pool_options(url, f"replica_{index}")) for index, url in enumerate(DATABASE_READ_URLS)
+    ]
+    for created in [engine, *read_engines]:
+        instrument(created)
+    session_local = make_sessionmaker(engine, read_engines)
+    resources = {
+        "engine": engine,
+        "read_engines": read_engines,
+        "SessionLocal": session_local,
+        # Sessions of read-only routes: with DB_AUTOCOMMIT_READS no transaction stays open between their SELECTs
+        "ReadSessionLocal": session_local,
+        "async_engine": None,
+        "async_read_engines": [],
+        "AsyncSessionLocal": None,
+        "AsyncReadSessionLocal": None,
+    }
+    if DB_AUTOCOMMIT_READS:
+        resources["ReadSessionLocal"] = make_sessionmaker(autocommit(engine), [autocommit(e) for e in read_engines])
+    if DATABASE_ASYNC:
+        resources.update(create_async_engines())
+    return resources
+
+
+def create_async_engines() -> dict:
+    """Async counterparts of create_engines."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    def make_async_sessionmaker(primary, replicas: list):
+        """Async counterpart of make_sessionmaker; routing goes through the sync session class and engines."""
+        # Objects must stay readable after commit: lazy refresh is not possible outside the greenlet
+        if replicas:
+            return async_sessionmaker(
+                sync_session_class=RoutingSession,
+                primary=primary.sync_engine,
+                replicas=cycle([replica.sync_engine for replica in replicas]),
+                autoflush=False,
+                expire_on_commit=False,
+            )
+        return async_sessionmaker(bind=primary, autoflush=False, expire_on_commit=False)
+
+    async_url = ASYNC_DATABASE_URL or get_async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(async_url, **pool_options(async_url, "primary_async", asynchronous=True))
+    async_read_engines = []
+    for index, url in enumerate(DATABASE_READ_URLS):
+        url = get_async_database_url(url)
+        async_read_engines.append(
+            create_async_engine(url, **pool_options(url, f"replica_{index}_async", asynchronous=True))
+        )
+    for created in [async_engine, *async_read_engines]:
+        instrument(created.sync_engine)
+    async_session_local = make_async_sessionmaker(async_engine, async_read_engines)
+    async_read_session_local = async_session_local
+    if DB_AUTOCOMMIT_READS:
+        async_read_session_local = make_async_sessionmaker(
+            autocommit(async_engine), [autocommit(e) for e in async_read_engines]
+        )
+    return {
+        "async_engine": async_engine,
+        "async_read_engines": async_read_engines,
+        "AsyncSessionLocal": async_session_local,
+        "AsyncReadSessionLocal": async_read_session_local,
+    }
+
+
+def init_engines() -> dict:
+    """Create the engines of this process once; called by the app lifespan or on first attribute access."""
+    with _lock:
+        if not _resources:
+            _resources.update(create_engines())
+        return _resources
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection and forget the engines, so the next use creates new ones."""
+    with _lock:
+        resources = dict(_resources)
+        _resources.clear()
+    if not resources:
+        return
+    for engine in [resources["engine"], *resources["read_engines"]]:
+        engine.dispose()
+    for engine in [resources["async_engine"], *resources["async_read_engines"]]:
+        if engine is not None:
+            await engine.dispose()
+
+
+def create_schema() -> None:
+    """Create missing tables and indexes (AUTO_CREATE_SCHEMA); migrations are run with Alembic."""
+    Base.metadata.create_all(bind=init_engines()["engine"])
+
+
+def __getattr__(name: str):
+    # configdb.engine, configdb.SessionLocal, ... resolve to the engines of this process, created on first use
+    if name in RESOURCE_NAMES:
+        return init_engines()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db():
-    db = SessionLocal()
+    db = init_engines()["SessionLocal"]()
     try:
         yield db
     finally:
         db.close()
-
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
@@ -1,32 +1,198 @@
+"""Bulk loader for characters.csv.
+
+Streams the CSV in chunks, converts every row once and writes it either
+straight to the database (multi-row upserts, or COPY on Postgres) or to a
+running API through POST /characters/bulk with concurrent pooled requests.
+
+    python -m app.data.db_from_csv                              # DATABASE_URL, batched upserts
+    python -m app.data.db_from_csv data.csv --copy              # Postgres COPY
+    python -m app.data.db_from_csv --mode http --url http://localhost:8000 --concurrency 8
+"""
+import argparse
 import csv
+import io
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "characters.csv")
+DEFAULT_CHUNK_SIZE = 1000
+# POST /characters/bulk limit
+HTTP_MAX_CHUNK_SIZE = 5000
+
+NAME_MAX_LENGTH = 50
+STRING_FIELDS = ("education", "identity", "other_aliases", "universe")
+FLOAT_FIELDS = ("height", "weight")
+FIELDS = ("name",) + STRING_FIELDS + FLOAT_FIELDS
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    if value is None or value.strip() == "":
+        return None
+    return float(value)
+
+
+def convert_row(row: dict) -> Optional[dict]:
+    """Convert a CSV row to CharacterCreate-compatible types, or None if the row is invalid."""
+    name = (row.get("name") or "").strip()
+    if not name or len(name) > NAME_MAX_LENGTH:
+        return None
+    character = {"name": name}
+    for field in STRING_FIELDS:
+        character[field] = row.get(field) or None
+    try:
+        for field in FLOAT_FIELDS:
+            character[field] = _to_float(row.get(field))
+    except ValueError:
+        return None
+    if any(character[field] is not None and character[field] < 0 for field in FLOAT_FIELDS):
+        return None
+    return character
+
+
+def read_chunks(file_path: str, chunk_size: int, stats: Counter) -> Iterator[List[dict]]:
+    """Yield converted characters in chunks; names are unique (case-insensitively) within a chunk."""
+    with open(file_path, newline='', encoding='utf-8') as csvfile:
+        chunk = {}
+        for row in csv.DictReader(csvfile):
+            stats["read"] += 1
+            character = convert_row(row)
+            if character is None:
+                stats["invalid"] += 1
+                continue
+            # A later duplicate replaces the earlier one, like a sequence of upserts would
+            chunk[character["name"].lower()] = character
+            if len(chunk) >= chunk_size:
+                yield list(chunk.values())
+                chunk = {}
+        if chunk:
+            yield list(chunk.values())
+
+
+def load_with_upserts(chunks: Iterator[List[dict]], stats: Counter, update_existing: bool) -> None:
+    """Write chunks with one multi-row INSERT ... ON CONFLICT per chunk."""
+    from app.configdb import SessionLocal
+    from app.services.character_service import CharacterService
+
+    with SessionLocal() as db:
+        for chunk in chunks:
+            stats.update(CharacterService.bulk_upsert_characters(chunk, db, update_existing=update_existing))
 
-import requests
 
-# Path to CSV file
-file_path = 'characters.csv'
+def load_with_copy(chunks: Iterator[List[dict]], stats: Counter, update_existing: bool) -> None:
+    """COPY every chunk into a temporary table, then merge it with a single INSERT ... SELECT (Postgres only)."""
+    from app.configdb import engine
 
-# API URL
-url = 'http://localhost:8000/character'
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("--copy requires a PostgreSQL DATABASE_URL")
 
-# Read data from CSV and make POST requests
-with open(file_path, newline='', encoding='utf-8') as csvfile:
-    reader = csv.DictReader(csvfile)
-    for row in reader:
-        character_data = {
-            'name': row.get('name'),
-            'education': row.get('education'),
-            'height': row.get('height'),
-            'identity': row.get('identity'),
-            'other_aliases': row.get('other_aliases'),
-            'universe': row.get('universe'),
-            'weight': row.get('weight')
-        }
+    columns = ", ".join(FIELDS)
+    if update_existing:
+        updates = ", ".join(f"{field} = EXCLUDED.{field}" for field in FIELDS)
+        updates += ", version = characters.version + 1"
+        on_conflict = f"ON CONFLICT (lower(name)) DO UPDATE SET {updates}"
+    else:
+        on_conflict = "ON CONFLICT (lower(name)) DO NOTHING"
 
-        response = requests.post(url, json=character_data)
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            "CREATE TEMPORARY TABLE characters_import ("
+            "name varchar, education varchar, identity varchar, other_aliases varchar, universe varchar, "
+            "height double precision, weight double precision, import_order bigserial) ON COMMIT DROP"
+        )
+        for chunk in chunks:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for character in chunk:
+                writer.writerow(["" if character[field] is None else character[field] for field in FIELDS])
+            buffer.seek(0)
+            # Unquoted empty fields are NULL in COPY's CSV format
+            cursor.copy_expert(f"COPY characters_import ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        # The last occurrence of a name wins, as with the chunked upserts
+        cursor.execute(
+            f"INSERT INTO characters ({columns}) "
+            f"SELECT DISTINCT ON (lower(name)) {columns} FROM characters_import "
+            f"ORDER BY lower(name), import_order DESC {on_conflict}"
+        )
+        stats["written"] += cursor.rowcount
+        connection.commit()
+    finally:
+        connection.close()
 
-        if response.status_code == 200:
-            print(f"Character {character_data['name']} successfully added.")
+
+def load_over_http(
+    chunks: Iterator[List[dict]], stats: Counter, update_existing: bool, url: str, concurrency: int
+) -> None:
+    """Send chunks to POST /characters/bulk concurrently over one pooled keep-alive session."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    bulk_url = f"{url.rstrip('/')}/characters/bulk"
+    params = {"on_conflict": "update" if update_existing else "skip"}
+
+    def post_chunk(chunk: List[dict]) -> Tuple[int, dict]:
+        response = session.post(bulk_url, json=chunk, params=params)
+        return response.status_code, response.json()
+
+    def collect(future) -> None:
+        status_code, body = future.result()
+        if status_code == 200:
+            stats.update(body["summary"])
         else:
-            print(f"Error adding character {character_data['name']}: {response.json()}")
+            print(f"Bulk request failed with {status_code}: {body}")
+            stats["failed_requests"] += 1
+
+    # At most 2 * concurrency chunks in flight keeps memory bounded for any file size
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(post_chunk, chunk))
+            if len(pending) >= 2 * concurrency:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load characters from a CSV file.")
+    parser.add_argument("file_path", nargs="?", default=DEFAULT_CSV_PATH, help="CSV file to load.")
+    parser.add_argument("--mode", choices=("db", "http"), default="db", help="Write to the database or the API.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per batch.")
+    parser.add_argument("--skip-existing", action="store_true", help="Keep existing characters unchanged.")
+    parser.add_argument("--copy", action="store_true", help="Use PostgreSQL COPY in db mode.")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base URL in http mode.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent requests in http mode.")
+    args = parser.parse_args()
+
+    chunk_size = args.chunk_size
+    if args.mode == "http":
+        chunk_size = min(chunk_size, HTTP_MAX_CHUNK_SIZE)
+
+    stats = Counter()
+    chunks = read_chunks(args.file_path, chunk_size, stats)
+    update_existing = not args.skip_existing
+    started = time.perf_counter()
+
+    if args.mode == "http":
+        load_over_http(chunks, stats, update_existing, args.url, args.concurrency)
+    elif args.copy:
+        load_with_copy(chunks, stats, update_existing)
+    else:
+        load_with_upserts(chunks, stats, update_existing)
+
+    elapsed = time.perf_counter() - started
+    summary = ", ".join(f"{key}={value}" for key, value in sorted(stats.items()))
+    print(f"Loaded {args.file_path}: {summary}")
+    print(f"{stats['read']} rows in {elapsed:.2f}s ({stats['read'] / elapsed if elapsed else 0:.0f} rows/s)")
+
 
-print("All characters processed!")
+if __name__ == "__main__":
+    main()
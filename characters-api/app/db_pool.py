@@ -0,0 +1,50 @@
+"""Connection pools that report checkouts and pool occupancy to Prometheus.
+
+The `pool` label is the engine's pool_logging_name, which survives
+engine.dispose() (the pool is recreated with the same class and name).
+"""
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.metrics import (
+    DB_POOL_CHECKOUT_FAILURES,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_IDLE,
+    DB_POOL_IN_USE,
+    DB_POOL_OVERFLOW,
+)
+
+
+class InstrumentedPoolMixin:
+    """Time every checkout, count failed ones, and export the occupancy of the latest pool of a name."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics_name = self._orig_logging_name or "default"
+        DB_POOL_IN_USE.labels(pool=self.metrics_name).set_function(self.checkedout)
+        DB_POOL_IDLE.labels(pool=self.metrics_name).set_function(self.checkedin)
+        DB_POOL_OVERFLOW.labels(pool=self.metrics_name).set_function(lambda: max(self.overflow(), 0))
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_FAILURES.labels(pool=self.metrics_name, reason="timeout").inc()
+            raise
+        except Exception:
+            DB_POOL_CHECKOUT_FAILURES.labels(pool=self.metrics_name, reason="error").inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(pool=self.metrics_name).observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    # Log under sqlalchemy.* like the stock pool, so echo_pool and logging levels behave the same
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
@@ -0,0 +1,41 @@
+"""Session that sends reads to read replicas and writes to the primary.
+
+Each session picks one replica, in round-robin order across sessions, on its
+first read and keeps it, so the statements of one request see one snapshot and
+SET LOCAL settings reach the query they are meant for. INSERT, UPDATE and
+DELETE go to the primary, and every later statement of the session follows
+them there, so a request reads its own writes.
+"""
+from typing import Iterator, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+# Session.info flag: route every statement of the session to the primary
+USE_PRIMARY = "use_primary"
+
+
+def use_primary(db) -> None:
+    """Pin a session (sync or async) to the primary, e.g. for a read that decides a write."""
+    db.info[USE_PRIMARY] = True
+
+
+class RoutingSession(Session):
+    """Session bound to a primary engine and a shared round-robin iterator over replica engines."""
+
+    def __init__(self, primary: Engine, replicas: Optional[Iterator[Engine]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self._replica = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replicas is None or self.info.get(USE_PRIMARY):
+            return self.primary
+        if self._flushing or isinstance(clause, UpdateBase):
+            use_primary(self)
+            return self.primary
+        if self._replica is None:
+            self._replica = next(self.replicas)
+        return self._replica
@@ -0,0 +1,118 @@
+"""Per-request SQL timing: statement count and duration by route, and a Server-Timing header.
+
+Cursor events of every engine feed the RequestTiming of the current request
+(a context variable set by QueryTimingMiddleware, inherited by the thread pool
+and by the async engines' greenlets). When the request ends the middleware
+observes the statements under the matched route template, so an N+1 pattern or
+an extra round trip such as db.refresh() shows up in the queries per request.
+"""
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from app.metrics import DB_QUERIES_PER_REQUEST, DB_QUERY_SECONDS, DB_REQUEST_SECONDS
+
+STATEMENT_KINDS = ("select", "insert", "update", "delete")
+# connection.info key of the start times of the statements running on a connection
+STARTED_KEY = "query_started"
+# Route label of requests that matched no route (404s)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestTiming:
+    """(kind, seconds) of every statement run by one request."""
+
+    __slots__ = ("statements",)
+
+    def __init__(self):
+        self.statements: List[Tuple[str, float]] = []
+
+    @property
+    def db_seconds(self) -> float:
+        return sum(seconds for _, seconds in self.statements)
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Server-Timing value: time in the database and time until the response started, in ms."""
+        count = len(self.statements)
+        return (
+            f'db;dur={self.db_seconds * 1000:.3f};desc="{count} {"query" if count == 1 else "queries"}", '
+            f"app;dur={total_seconds * 1000:.3f}"
+        )
+
+    def observe(self, method: str, route: str) -> None:
+        for kind, seconds in self.statements:
+            DB_QUERY_SECONDS.labels(method=method, route=route, kind=kind).observe(seconds)
+        DB_QUERIES_PER_REQUEST.labels(method=method, route=route).observe(len(self.statements))
+        DB_REQUEST_SECONDS.labels(method=method, route=route).observe(self.db_seconds)
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def statement_kind(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    kind = words[0].lower() if words else ""
+    return kind if kind in STATEMENT_KINDS else "other"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info[STARTED_KEY].pop()
+    timing = _current.get()
+    if timing is not None:
+        timing.statements.append((statement_kind(statement), seconds))
+
+
+def _handle_error(exception_context):
+    # A failed statement gets no after_cursor_execute: drop its start time
+    started = exception_context.connection is not None and exception_context.connection.info.get(STARTED_KEY)
+    if started:
+        started.pop()
+
+
+def instrument(engine) -> None:
+    """Time the statements of a sync engine (for an async engine, pass its sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def route_label(scope) -> str:
+    """The path template of the matched route, which keeps the label's cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class QueryTimingMiddleware:
+    """ASGI middleware collecting the SQL statements of each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timing.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            # Statements of a streamed body run after the header was sent: they are still observed here
+            timing.observe(scope["method"], route_label(scope))
@@ -0,0 +1,56 @@
+"""Application metrics, registered in the default Prometheus registry served on /metrics."""
+from prometheus_client import Counter, Gauge, Histogram
+
+CACHE_HITS = Counter("characters_cache_hits_total", "Cache lookups served from the cache", ["cache"])
+CACHE_MISSES = Counter("characters_cache_misses_total", "Cache lookups that went to the database", ["cache"])
+CACHE_EVICTIONS = Counter(
+    "characters_cache_evictions_total", "Entries removed from the cache before being read again", ["cache", "reason"]
+)
+CACHE_ENTRIES = Gauge("characters_cache_entries", "Entries currently held in the cache", ["cache"])
+CACHE_ERRORS = Counter(
+    "characters_cache_errors_total", "Cache operations that failed and fell back to the database", ["cache", "operation"]
+)
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "characters_db_pool_checkout_seconds",
+    "Time to check a connection out of the pool, including waiting for a free one",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CHECKOUT_FAILURES = Counter(
+    "characters_db_pool_checkout_failures_total", "Connection checkouts that failed", ["pool", "reason"]
+)
+DB_POOL_IN_USE = Gauge("characters_db_pool_connections_in_use", "Connections currently checked out", ["pool"])
+DB_POOL_IDLE = Gauge("characters_db_pool_connections_idle", "Open connections waiting in the pool", ["pool"])
+DB_POOL_OVERFLOW = Gauge(
+    "characters_db_pool_overflow_connections", "Connections open beyond pool_size (max_overflow)", ["pool"]
+)
+
+DB_SESSION_SECONDS = Histogram(
+    "characters_db_session_seconds",
+    "Lifetime of request sessions, from first use to close",
+    ["mode"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_SESSIONS = Counter(
+    "characters_db_sessions_total", "Request sessions, by whether the request used the database", ["mode", "used"]
+)
+
+DB_QUERY_SECONDS = Histogram(
+    "characters_db_query_seconds",
+    "Duration of SQL statements run by a request, by route and statement kind",
+    ["method", "route", "kind"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "characters_db_queries_per_request",
+    "SQL statements run by one request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50, 100),
+)
+DB_REQUEST_SECONDS = Histogram(
+    "characters_db_request_seconds",
+    "Time one request spent in SQL statements",
+    ["method", "route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float
+from sqlalchemy import DDL, Column, String, Integer, Float, Index, event, func, text
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -9,10 +9,52 @@ class Character(Base):
     __tablename__ = 'characters'
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, unique=True, index=True, nullable=False)
+    # Unique and indexed through ix_characters_name_lower below
+    name = Column(String, nullable=False)
     education = Column(String, nullable=True)
     height = Column(Float, nullable=True)
     identity = Column(String, nullable=True)
     other_aliases = Column(String, nullable=True)
     universe = Column(String, nullable=True)
     weight = Column(Float, nullable=True)
+    # Incremented by every write; basis of the ETags on read routes
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+
+    __table_args__ = (
+        # Serves the case-insensitive lookups (lower(name) = :name) and enforces case-insensitive uniqueness
+        Index("ix_characters_name_lower", func.lower(name), unique=True),
+        # List filters: equality on the column, then the id order of the page (offset and keyset)
+        Index("ix_characters_universe_id", universe, id),
+        Index("ix_characters_identity_id", identity, id),
+        Index("ix_characters_education_id", education, id),
+        # Range filters
+        Index("ix_characters_height", height),
+        Index("ix_characters_weight", weight),
+        # name_prefix filter (PostgreSQL only): lower(name) LIKE 'prefix%' needs pattern ops outside the C collation
+        Index(
+            "ix_characters_name_lower_pattern",
+            func.lower(name).label("name_lower"),
+            postgresql_ops={"name_lower": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Fuzzy search (PostgreSQL only, pg_trgm): served by GIN trigram indexes, as in migration 005
+        Index(
+            "ix_characters_name_trgm",
+            func.lower(name).label("name_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"name_lower": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_characters_other_aliases_trgm",
+            func.lower(other_aliases).label("other_aliases_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"other_aliases_lower": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# create_all() needs pg_trgm for the trigram indexes; migration 005 creates it the same way
+event.listen(
+    Character.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,190 @@
+"""Opt-in stack-sampling profiler for requests, kept in memory and served as collapsed stacks.
+
+While at least one request is being profiled, a daemon thread takes the Python
+stack of every other thread of the worker every PROFILING_INTERVAL_MS and adds
+it to each running profile. Sampling all threads covers async routes on the
+event loop and sync service calls in the thread pool alike; concurrent requests
+therefore share samples. Threads waiting for work are left out.
+
+Profiles are kept in a ring buffer and rendered in the collapsed-stack format
+("frame;frame;frame count" lines) read by flamegraph.pl, speedscope and
+similar tools, so no external service is involved.
+"""
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, Iterable, Optional
+
+from app.config import (
+    PROFILING_INTERVAL_MS,
+    PROFILING_MAX_PROFILES,
+    PROFILING_SAMPLE_RATE,
+    PROFILING_SLOW_MS,
+)
+from app.db_timing import route_label
+
+# Innermost frames of threads that are blocked waiting for work, not running it
+# (_connection_worker_thread: aiosqlite's connection thread waiting on its queue)
+IDLE_FRAMES = {"wait", "select", "poll", "control", "accept", "_connection_worker_thread"}
+# Requests never profiled: reading profiles must not evict them
+EXCLUDED_PREFIX = "/admin/"
+
+
+class Profile:
+    """Collapsed stacks sampled while one request ran."""
+
+    def __init__(self, profile_id: int, method: str, path: str):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.route = None
+        self.reason = None
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+        self.stacks = Counter()
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "reason": self.reason,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "samples": sum(self.stacks.values()),
+        }
+
+
+def frame_name(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}".replace(";", ":")
+
+
+def collapse(thread_name: str, frame) -> Optional[str]:
+    """The stack of a thread, outermost frame first, or None for a thread waiting for work."""
+    if frame.f_code.co_name in IDLE_FRAMES:
+        return None
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    names.append(thread_name.replace(";", ":"))
+    return ";".join(reversed(names))
+
+
+def render(stacks: Counter) -> str:
+    """Collapsed-stack text, heaviest stacks first."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class StackSampler:
+    """One sampling thread, running only while profiles are active."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        # Keyed on profile id: two empty Counters compare equal, so they cannot be told apart by value
+        self._active: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, profile_id: int, stacks: Counter) -> None:
+        with self._lock:
+            self._active[profile_id] = stacks
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def stop(self, profile_id: int) -> None:
+        with self._lock:
+            self._active.pop(profile_id, None)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            sample = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = collapse(names.get(thread_id, str(thread_id)), frame)
+                if stack is not None:
+                    sample.append(stack)
+            # Added under the lock to the profiles active now: once stop() returns, a profile gets no more samples
+            with self._lock:
+                for stacks in self._active.values():
+                    stacks.update(sample)
+            time.sleep(self.interval_seconds)
+
+
+class Profiler:
+    """Decides which requests to profile and keeps the last profiles."""
+
+    def __init__(self, sample_rate: float, slow_ms: float, interval_ms: float, max_profiles: int):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.sampler = StackSampler(interval_ms / 1000)
+        self.profiles = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+
+    def begin(self, method: str, path: str) -> Optional[Profile]:
+        """A profile for this request, or None. Every request is profiled when slow requests are kept."""
+        sampled = random.random() < self.sample_rate
+        if not sampled and self.slow_ms <= 0:
+            return None
+        profile = Profile(next(self._ids), method, path)
+        profile.reason = "sampled" if sampled else None
+        self.sampler.start(profile.id, profile.stacks)
+        return profile
+
+    def end(self, profile: Profile, route: str, duration_ms: float) -> None:
+        self.sampler.stop(profile.id)
+        profile.route, profile.duration_ms = route, duration_ms
+        if profile.reason is None and duration_ms >= self.slow_ms:
+            profile.reason = "slow"
+        if profile.reason is not None:
+            self.profiles.append(profile)
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        return next((profile for profile in self.profiles if profile.id == profile_id), None)
+
+    def merged(self, profiles: Iterable[Profile]) -> Counter:
+        stacks = Counter()
+        for profile in profiles:
+            stacks.update(profile.stacks)
+        return stacks
+
+    def clear(self) -> None:
+        self.profiles.clear()
+
+
+profiler = Profiler(PROFILING_SAMPLE_RATE, PROFILING_SLOW_MS, PROFILING_INTERVAL_MS, PROFILING_MAX_PROFILES)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling the HTTP requests chosen by the profiler (PROFILING_ENABLED)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        profile = None
+        if scope["type"] == "http" and not scope["path"].startswith(EXCLUDED_PREFIX):
+            profile = profiler.begin(scope["method"], scope["path"])
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.end(profile, route_label(scope), (time.perf_counter() - started) * 1000)
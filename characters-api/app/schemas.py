@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -29,3 +29,67 @@ class CharacterResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class CharacterListResponse(BaseModel):
+    """Data model for a page of characters; next_cursor is only sent in cursor mode."""
+    result: List[CharacterResponse]
+    next_cursor: Optional[str] = None
+
+
+class BatchGetRequest(BaseModel):
+    """Names to look up in one request (case-insensitive)."""
+    names: List[str] = Field(..., description="Character names")
+
+
+class BatchGetResponse(BaseModel):
+    """Found characters in request order, and the names that matched nothing."""
+    result: List[CharacterResponse]
+    missing: List[str]
+
+
+class BulkDeleteRequest(BaseModel):
+    """Characters to delete: either names, or list filters (at least one)."""
+    names: Optional[List[str]] = Field(None, description="Character names (case-insensitive)")
+    universe: Optional[str] = None
+    identity: Optional[str] = None
+    education: Optional[str] = None
+    other_aliases: Optional[str] = None
+    min_height: Optional[float] = Field(None, ge=0)
+    max_height: Optional[float] = Field(None, ge=0)
+    min_weight: Optional[float] = Field(None, ge=0)
+    max_weight: Optional[float] = Field(None, ge=0)
+    name_prefix: Optional[str] = Field(None, min_length=1, description="Case-insensitive name prefix")
+    dry_run: bool = Field(False, description="Only count the matching characters")
+    max_rows: int = Field(1000, ge=1, le=10000, description="Refuse to delete more characters than this")
+
+
+class BulkDeleteResponse(BaseModel):
+    """Number of matching characters and the names actually deleted (none on a dry run)."""
+    matched: int
+    deleted: List[str]
+    dry_run: bool
+
+
+class CharacterSearchResult(CharacterResponse):
+    """A search hit: the character and how well it matches the query (0 to 1)."""
+    score: float
+
+
+class CharacterSearchResponse(BaseModel):
+    """Data model for search hits, best first."""
+    result: List[CharacterSearchResult]
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item of a bulk write: created, updated, conflict, invalid or failed."""
+    index: int
+    name: Optional[Any] = None
+    status: str
+    detail: Optional[Any] = None
+
+
+class BulkWriteResponse(BaseModel):
+    """Data model for a bulk write: per-item results and counts per status."""
+    result: List[BulkItemResult]
+    summary: Dict[str, int]
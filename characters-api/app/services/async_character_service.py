@@ -0,0 +1,265 @@
+"""Async character service layer running on SQLAlchemy AsyncSession."""
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import Row, select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from app.api.exceptions import CharacterAlreadyExistsError
+from app.db_routing import use_primary
+from app.model import Character
+from app.services.character_search import (
+    index_source_statement,
+    is_query_canceled,
+    search_index,
+    search_settings_statements,
+    trigram_search_statement,
+)
+from app.services.character_service import (
+    BULK_CHUNK_SIZE,
+    BULK_DELETE_CAP_MSG,
+    BULK_FAILED,
+    CHARACTER_NOT_FOUND_MSG,
+    DATABASE_ERROR_MSG,
+    SEARCH_TIMEOUT_MSG,
+    bulk_delete_statement,
+    bulk_statuses,
+    count_statement,
+    delete_statement,
+    insert_statement,
+    name_matches,
+    names_statement,
+    page_rows_statement,
+    page_statement,
+    page_versions_statement,
+    projection_statement,
+    ranked_results,
+    response_columns,
+    rows_by_id_statement,
+    search_result,
+    selection_conditions,
+    update_statement,
+    upsert_statement,
+    version_statement,
+)
+
+
+class AsyncCharacterService:
+    """Async counterpart of CharacterService with the same method signatures."""
+
+    @staticmethod
+    async def _find_by_name(name: str, db: AsyncSession):
+        result = await db.execute(select(Character).where(name_matches(name)).limit(1))
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_all_characters(
+        db: AsyncSession, skip: int = 0, limit: int = 100, filters: Optional[Dict[str, object]] = None
+    ) -> List[Character]:
+        """Get all characters matching the filters with pagination."""
+        result = await db.execute(page_statement(select(Character), skip, limit, filters=filters))
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_characters_after(
+        db: AsyncSession, after_id: int = 0, limit: int = 100, filters: Optional[Dict[str, object]] = None
+    ) -> List[Character]:
+        """Get characters matching the filters with id greater than after_id (keyset pagination)."""
+        result = await db.execute(
+            page_statement(select(Character), limit=limit, after_id=after_id, filters=filters)
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_character_by_name(name: str, db: AsyncSession) -> Character:
+        """Get character by name (case-insensitive)."""
+        character = await AsyncCharacterService._find_by_name(name, db)
+
+        if not character:
+            raise HTTPException(status_code=400, detail=CHARACTER_NOT_FOUND_MSG)
+
+        return character
+
+    @staticmethod
+    async def get_characters_by_names(names: List[str], db: AsyncSession) -> List[Row]:
+        """Get the characters with the given names (case-insensitive) in a single IN query."""
+        result = await db.execute(names_statement(names))
+        return result.all()
+
+    @staticmethod
+    async def get_character_fields(name: str, db: AsyncSession, fields: Optional[Sequence[str]] = None) -> Row:
+        """Get (id, version, *fields) of a character by name, loading only those columns."""
+        result = await db.execute(projection_statement(name, fields))
+        character = result.first()
+
+        if not character:
+            raise HTTPException(status_code=400, detail=CHARACTER_NOT_FOUND_MSG)
+
+        return character
+
+    @staticmethod
+    async def get_character_version(name: str, db: AsyncSession) -> Optional[Row]:
+        """Get the (id, version) of a character without loading the row."""
+        result = await db.execute(version_statement(name))
+        return result.first()
+
+    @staticmethod
+    async def get_page_versions(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        filters: Optional[Dict[str, object]] = None,
+    ) -> List[Row]:
+        """Get the (id, version) keys of a list page without loading the rows."""
+        result = await db.execute(page_versions_statement(skip, limit, after_id, filters))
+        return result.all()
+
+    @staticmethod
+    async def get_page_rows(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, object]] = None,
+    ) -> List[Row]:
+        """Get a list page as (id, version, *fields) rows, without building ORM objects."""
+        result = await db.execute(page_rows_statement(skip, limit, after_id, fields, filters))
+        return result.all()
+
+    @staticmethod
+    async def search_characters(query: str, db: AsyncSession, limit: int = 20) -> List[dict]:
+        """Rank characters by a fuzzy match of the query on name and other_aliases."""
+        if db.get_bind().dialect.name != "postgresql":
+            if search_index.needs_rebuild():
+                generation = search_index.generation
+                result = await db.execute(index_source_statement())
+                search_index.build(result, generation)
+            ranked = search_index.search(query, limit)
+            result = await db.execute(rows_by_id_statement(character_id for character_id, _ in ranked))
+            return ranked_results(result.all(), ranked)
+
+        try:
+            for statement in search_settings_statements():
+                await db.execute(statement)
+            result = await db.execute(trigram_search_statement(query, limit, response_columns()))
+            rows = result.all()
+        except DBAPIError as e:
+            await db.rollback()
+            if is_query_canceled(e):
+                raise HTTPException(status_code=503, detail=SEARCH_TIMEOUT_MSG)
+            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when searching characters")
+        # Ending the transaction also resets the SET LOCAL settings
+        await db.rollback()
+        return [search_result(row, row.score) for row in rows]
+
+    @staticmethod
+    async def create_character(character_data: dict, db: AsyncSession) -> Row:
+        """Create a new character with a single INSERT ... RETURNING."""
+        try:
+            result = await db.execute(insert_statement(character_data))
+            character = result.one()
+            await db.commit()
+            return character
+        except IntegrityError:
+            await db.rollback()
+            raise CharacterAlreadyExistsError(character_data["name"])
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when creating character")
+
+    @staticmethod
+    async def update_character(character_data: dict, db: AsyncSession) -> Row:
+        """Update an existing character with a single UPDATE ... RETURNING."""
+        try:
+            result = await db.execute(update_statement(character_data))
+            character = result.first()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when updating character")
+
+        if not character:
+            raise HTTPException(status_code=404, detail="Character not found for update")
+
+        return character
+
+    @staticmethod
+    async def delete_character(name: str, db: AsyncSession) -> str:
+        """Delete a character by name with a single DELETE ... RETURNING."""
+        try:
+            result = await db.execute(delete_statement(name))
+            deleted = result.first()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when deleting character")
+
+        if not deleted:
+            raise HTTPException(status_code=400, detail="Deletion not possible")
+
+        return f"Character {name} deleted"
+
+    @staticmethod
+    async def bulk_delete_characters(
+        db: AsyncSession,
+        names: Optional[List[str]] = None,
+        filters: Optional[Dict[str, object]] = None,
+        max_rows: int = 1000,
+        dry_run: bool = False,
+    ) -> Tuple[int, List[str]]:
+        """Delete every character with one of the names, or matching the filters, in one statement."""
+        conditions = selection_conditions(names, filters)
+        # The count must see what the DELETE will see
+        use_primary(db)
+        try:
+            result = await db.execute(count_statement(conditions))
+            matched = result.scalar_one()
+            deleted = []
+            if not dry_run and matched <= max_rows:
+                result = await db.execute(bulk_delete_statement(conditions))
+                deleted = list(result.scalars())
+                # Rows may have been added between the count and the delete
+                matched = len(deleted)
+            if dry_run or matched > max_rows:
+                await db.rollback()
+            else:
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when deleting characters")
+
+        if matched > max_rows and not dry_run:
+            raise HTTPException(status_code=400, detail=BULK_DELETE_CAP_MSG.format(matched=matched, max_rows=max_rows))
+
+        return matched, deleted
+
+    @staticmethod
+    async def bulk_upsert_characters(
+        characters: List[dict], db: AsyncSession, update_existing: bool = True
+    ) -> List[str]:
+        """Create or update many characters with one INSERT ... ON CONFLICT per chunk."""
+        dialect_name = db.get_bind().dialect.name
+        statuses = []
+        for start in range(0, len(characters), BULK_CHUNK_SIZE):
+            chunk = characters[start:start + BULK_CHUNK_SIZE]
+            try:
+                result = await db.execute(upsert_statement(dialect_name, chunk, update_existing))
+                written = result.all()
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                statuses.extend([BULK_FAILED] * len(chunk))
+                continue
+            statuses.extend(bulk_statuses(chunk, written))
+        return statuses
+
+    @staticmethod
+    async def check_db_connection(db: AsyncSession) -> bool:
+        """Check database connection."""
+        try:
+            await db.execute(select(Character).limit(1))
+            return True
+        except Exception:
+            return False
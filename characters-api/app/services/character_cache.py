@@ -0,0 +1,135 @@
+"""Read-through cache of character payloads for lookups by name.
+
+The lookups and writes are coroutines: with a network backend (Redis) they run
+in the threadpool, like the sync service calls, so a slow cache server never
+blocks the event loop. The in-process LRU is called directly.
+
+Entries loaded from the database are only added, never overwritten, and a write
+leaves a tombstone for CACHE_INVALIDATION_HOLD_SECONDS: a read that loaded the
+old row before the write (or from a lagging replica) is not cached. With the
+memory backend every worker has its own cache and only sees its own writes;
+writes made through another worker show up after CACHE_TTL_SECONDS.
+"""
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.api.etag import character_etag
+from app.cache import MISSING, CacheBackend, build_cache
+from app.config import CACHE_ENABLED, CACHE_INVALIDATION_HOLD_SECONDS, CACHE_NEGATIVE_TTL_SECONDS
+from app.services.character_service import RESPONSE_FIELDS
+
+# Cached for names the database does not know, when negative caching is enabled (JSON null)
+NOT_FOUND = None
+
+# Built on first use: the Redis backend connects and starts its invalidation thread,
+# which must happen in the worker process, not at import
+_cache: Optional[CacheBackend] = None
+_cache_lock = threading.Lock()
+
+
+def _backend() -> Optional[CacheBackend]:
+    global _cache
+    if _cache is None and CACHE_ENABLED:
+        with _cache_lock:
+            if _cache is None:
+                _cache = build_cache("character")
+    return _cache
+
+
+def to_payload(character: Any) -> dict:
+    """Serialize an ORM object or row to the CharacterResponse dict."""
+    return {field: getattr(character, field) for field in RESPONSE_FIELDS}
+
+
+async def _call(cache: CacheBackend, function, *args, **kwargs) -> Any:
+    """Call a backend method, off the event loop when the backend waits on the network."""
+    if cache.blocking:
+        return await run_in_threadpool(function, *args, **kwargs)
+    return function(*args, **kwargs)
+
+
+def _get_many(cache: CacheBackend, names: Iterable[str]) -> Dict[str, Any]:
+    return {name.lower(): cache.get(name.lower()) for name in names}
+
+
+def _store_many(cache: CacheBackend, entries: Dict[str, dict]) -> None:
+    for key, entry in entries.items():
+        cache.add(key, entry)
+
+
+def _store_many_not_found(cache: CacheBackend, names: Iterable[str]) -> None:
+    for name in names:
+        cache.add(name.lower(), NOT_FOUND, ttl_seconds=CACHE_NEGATIVE_TTL_SECONDS)
+
+
+def _entry(character: Any) -> dict:
+    return {"etag": character_etag(character.id, character.version), "result": to_payload(character)}
+
+
+async def get(name: str) -> Any:
+    """Return the cached entry ({"etag", "result"}), NOT_FOUND, or MISSING."""
+    cache = _backend()
+    if cache is None:
+        return MISSING
+    return await _call(cache, cache.get, name.lower())
+
+
+async def get_many(names: Iterable[str]) -> Dict[str, Any]:
+    """Look up many names at once; returns each lowercased name's entry, NOT_FOUND, or MISSING."""
+    cache = _backend()
+    if cache is None:
+        return {name.lower(): MISSING for name in names}
+    return await _call(cache, _get_many, cache, names)
+
+
+async def store(name: str, character: Any) -> dict:
+    """Cache and return the entry of a character loaded from the database: its ETag and payload.
+
+    The entry is not stored when the name is already cached or was invalidated within the hold.
+    """
+    entry = _entry(character)
+    cache = _backend()
+    if cache is not None:
+        await _call(cache, cache.add, name.lower(), entry)
+    return entry
+
+
+async def store_many(characters: Iterable[Any]) -> Dict[str, dict]:
+    """Cache characters loaded from the database; returns their entries by lowercased name."""
+    entries = {character.name.lower(): _entry(character) for character in characters}
+    cache = _backend()
+    if cache is not None and entries:
+        await _call(cache, _store_many, cache, entries)
+    return entries
+
+
+async def store_not_found(*names: str) -> None:
+    cache = _backend()
+    if cache is not None and CACHE_NEGATIVE_TTL_SECONDS > 0 and names:
+        await _call(cache, _store_many_not_found, cache, names)
+
+
+async def invalidate(*names: str) -> None:
+    """Drop cached entries after a write to these names."""
+    cache = _backend()
+    if cache is not None:
+        await _call(
+            cache, cache.invalidate, *(name.lower() for name in names), hold_seconds=CACHE_INVALIDATION_HOLD_SECONDS
+        )
+
+
+def clear() -> None:
+    cache = _backend()
+    if cache is not None:
+        cache.clear()
+
+
+def close() -> None:
+    """Release the backend (Redis connection and subscriber thread); the next use builds a new one."""
+    global _cache
+    with _cache_lock:
+        cache, _cache = _cache, None
+    if cache is not None:
+        cache.close()
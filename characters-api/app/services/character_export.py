@@ -0,0 +1,70 @@
+"""Streaming export of the whole character table as NDJSON or CSV."""
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterator, Sequence
+
+from sqlalchemy import select
+
+from app import configdb
+from app.model import Character
+from app.services.character_service import RESPONSE_COLUMNS, RESPONSE_FIELDS
+
+# Rows fetched per server-side cursor round trip and encoded per chunk
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def export_statement():
+    """Select the CharacterResponse columns, streamed in EXPORT_BATCH_SIZE partitions."""
+    return select(*RESPONSE_COLUMNS).order_by(Character.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def encode_ndjson(rows: Sequence) -> bytes:
+    """Encode rows as one JSON object per line."""
+    return "".join(
+        json.dumps(dict(zip(RESPONSE_FIELDS, row)), ensure_ascii=False) + "\n" for row in rows
+    ).encode("utf-8")
+
+
+def encode_csv(rows: Sequence) -> bytes:
+    """Encode rows as CSV lines."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encoder(export_format: str):
+    return encode_csv if export_format == "csv" else encode_ndjson
+
+
+def iter_export(export_format: str) -> Iterator[bytes]:
+    """Stream the table through a sync session.
+
+    The session is owned by the generator so it stays open for as long as the
+    response is being sent, independently of request dependencies.
+    """
+    encode = _encoder(export_format)
+    db = configdb.SessionLocal()
+    try:
+        if export_format == "csv":
+            yield encode([RESPONSE_FIELDS])
+        for partition in db.execute(export_statement()).partitions():
+            yield encode(partition)
+    finally:
+        db.close()
+
+
+async def aiter_export(export_format: str) -> AsyncIterator[bytes]:
+    """Stream the table through an async session (server-side cursor)."""
+    encode = _encoder(export_format)
+    async with configdb.AsyncSessionLocal() as db:
+        if export_format == "csv":
+            yield encode([RESPONSE_FIELDS])
+        result = await db.stream(export_statement())
+        async for partition in result.partitions():
+            yield encode(partition)
@@ -0,0 +1,136 @@
+"""Fuzzy search on name and other_aliases: pg_trgm on PostgreSQL, an in-memory trigram index elsewhere.
+
+Both score a character by the share of the query's trigrams found in a word
+sequence of its name (pg_trgm word similarity), alias matches slightly below
+name matches, so "spider" finds "Spider-Man" and so does the typo "spidr".
+"""
+import heapq
+import re
+import threading
+import time
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, literal, or_, select, text
+from sqlalchemy.exc import DBAPIError
+
+from app.config import SEARCH_INDEX_TTL_SECONDS, SEARCH_MIN_SCORE, SEARCH_TIMEOUT_MS
+from app.model import Character
+
+# Alias matches rank below name matches of the same quality
+ALIAS_WEIGHT = 0.9
+# SQLSTATE of a statement cancelled by statement_timeout
+QUERY_CANCELED = "57014"
+
+WORD_SEPARATORS = re.compile(r"\W+")
+
+
+def trigrams(value: Optional[str]) -> set:
+    """pg_trgm-style trigrams: every lowercased word padded with two spaces in front and one behind."""
+    result = set()
+    for word in WORD_SEPARATORS.split((value or "").lower()):
+        if word:
+            padded = f"  {word} "
+            result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class TrigramIndex:
+    """Inverted index from trigram to the ids of the characters whose name or aliases contain it.
+
+    Rebuilt from the table on the first search after a local write (invalidate)
+    or after ttl_seconds, which bounds how long writes of other processes go unseen.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._names = {}
+        self._aliases = {}
+        self._built_generation = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def needs_rebuild(self) -> bool:
+        return self._built_generation != self.generation or time.monotonic() - self._built_at > self.ttl_seconds
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+
+    def build(self, rows: Iterable, generation: int) -> None:
+        """Index (id, name, other_aliases) rows read after `generation` was taken from self.generation."""
+        names, aliases = {}, {}
+        for character_id, name, other_aliases in rows:
+            for trigram in trigrams(name):
+                names.setdefault(trigram, []).append(character_id)
+            for trigram in trigrams(other_aliases):
+                aliases.setdefault(trigram, []).append(character_id)
+        with self._lock:
+            # A write during the build bumped the generation: keep the index but rebuild on next use
+            self._names, self._aliases = names, aliases
+            self._built_generation, self._built_at = generation, time.monotonic()
+
+    def search(self, query: str, limit: int, min_score: float = SEARCH_MIN_SCORE) -> List[Tuple[int, float]]:
+        """Return up to limit (id, score) pairs, best first."""
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return []
+        names, aliases = self._names, self._aliases
+        name_hits, alias_hits = Counter(), Counter()
+        for trigram in query_trigrams:
+            name_hits.update(names.get(trigram, ()))
+            alias_hits.update(aliases.get(trigram, ()))
+
+        total = len(query_trigrams)
+        scores = {character_id: hits / total for character_id, hits in name_hits.items()}
+        for character_id, hits in alias_hits.items():
+            scores[character_id] = max(scores.get(character_id, 0.0), ALIAS_WEIGHT * hits / total)
+        ranked = ((character_id, score) for character_id, score in scores.items() if score >= min_score)
+        return heapq.nlargest(limit, ranked, key=lambda item: (item[1], -item[0]))
+
+
+# Fallback index of this process, used when the database is not PostgreSQL
+search_index = TrigramIndex(SEARCH_INDEX_TTL_SECONDS)
+
+
+def invalidate() -> None:
+    """Mark the in-memory index stale after a write."""
+    search_index.invalidate()
+
+
+def index_source_statement():
+    """Select what the in-memory index is built from."""
+    return select(Character.id, Character.name, Character.other_aliases)
+
+
+def search_settings_statements() -> list:
+    """SET LOCAL statements giving one search its time budget and score threshold (PostgreSQL)."""
+    return [
+        text(f"SET LOCAL statement_timeout = {int(SEARCH_TIMEOUT_MS)}"),
+        text(f"SET LOCAL pg_trgm.word_similarity_threshold = {float(SEARCH_MIN_SCORE)}"),
+    ]
+
+
+def trigram_search_statement(query: str, limit: int, columns: tuple):
+    """Rank rows by pg_trgm word similarity; `<%` is served by the GIN trigram indexes."""
+    query = literal(query.lower())
+    name = func.lower(Character.name)
+    aliases = func.lower(Character.other_aliases)
+    score = func.greatest(
+        func.word_similarity(query, name), ALIAS_WEIGHT * func.coalesce(func.word_similarity(query, aliases), 0)
+    ).label("score")
+    return (
+        select(*columns, score)
+        .where(or_(query.op("<%")(name), query.op("<%")(aliases)))
+        .order_by(score.desc(), Character.id)
+        .limit(limit)
+    )
+
+
+def is_query_canceled(error: DBAPIError) -> bool:
+    """True when PostgreSQL cancelled the statement (statement_timeout)."""
+    return getattr(error.orig, "pgcode", None) == QUERY_CANCELED
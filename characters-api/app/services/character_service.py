@@ -1,106 +1,445 @@
 """Character service layer for business logic."""
-from typing import List, Optional
-from sqlalchemy import func
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Row, delete, func, insert, select, update
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
+from app.api.exceptions import CharacterAlreadyExistsError
+from app.db_routing import use_primary
 from app.model import Character
+from app.services.character_search import (
+    index_source_statement,
+    is_query_canceled,
+    search_index,
+    search_settings_statements,
+    trigram_search_statement,
+)
 
 # Constants
 DATABASE_ERROR_MSG = "Database error"
+CHARACTER_NOT_FOUND_MSG = "Character with this name not found"
+BULK_DELETE_CAP_MSG = "{matched} characters match, more than max_rows={max_rows}; nothing was deleted"
+SEARCH_TIMEOUT_MSG = "Search exceeded its time budget"
+# Rows per multi-row INSERT ... ON CONFLICT statement in bulk writes
+BULK_CHUNK_SIZE = 500
+
+# List filters: exact match on these columns, min_/max_ bounds on the ranged ones
+EQUALITY_FILTERS = ("universe", "identity", "education", "other_aliases")
+RANGE_FILTERS = ("height", "weight")
+
+BULK_CREATED = "created"
+BULK_UPDATED = "updated"
+BULK_CONFLICT = "conflict"
+BULK_INVALID = "invalid"
+BULK_FAILED = "failed"
+BULK_FAILED_MSG = f"{DATABASE_ERROR_MSG} when writing characters"
+
+# Version of a newly inserted row; every update increments it
+INITIAL_VERSION = 1
+
+# CharacterResponse columns, in response order
+RESPONSE_COLUMNS = (
+    Character.name,
+    Character.education,
+    Character.height,
+    Character.identity,
+    Character.other_aliases,
+    Character.universe,
+    Character.weight,
+)
+RESPONSE_FIELDS = tuple(column.key for column in RESPONSE_COLUMNS)
+
+# Single-row writes go through Core statements: no ORM identity map, no refresh round trip
+characters_table = Character.__table__
+
+
+def name_matches(name: str):
+    """Case-insensitive name predicate shared by the sync and async services."""
+    return func.lower(Character.name) == name.lower()
+
+
+def version_statement(name: str):
+    """Select only the id and version of the character with a matching name."""
+    return select(Character.id, Character.version).where(name_matches(name)).limit(1)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so the value matches literally (escape character: backslash)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def filter_conditions(filters: Optional[Dict[str, object]] = None) -> list:
+    """WHERE conditions of the list filters; keys are the query parameter names."""
+    if not filters:
+        return []
+    conditions = []
+    for field in EQUALITY_FILTERS:
+        if filters.get(field) is not None:
+            conditions.append(getattr(Character, field) == filters[field])
+    for field in RANGE_FILTERS:
+        if filters.get(f"min_{field}") is not None:
+            conditions.append(getattr(Character, field) >= filters[f"min_{field}"])
+        if filters.get(f"max_{field}") is not None:
+            conditions.append(getattr(Character, field) <= filters[f"max_{field}"])
+    if filters.get("name_prefix"):
+        # Same lower(name) expression as the lookups, so the prefix match is case-insensitive too
+        pattern = escape_like(filters["name_prefix"].lower()) + "%"
+        conditions.append(func.lower(Character.name).like(pattern, escape="\\"))
+    return conditions
+
+
+def page_statement(
+    statement,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    filters: Optional[Dict[str, object]] = None,
+):
+    """Restrict a select to one filtered list page: offset mode, or keyset mode after after_id."""
+    statement = statement.where(*filter_conditions(filters)).order_by(Character.id).limit(limit)
+    if after_id is not None:
+        return statement.where(Character.id > after_id)
+    return statement.offset(skip)
+
+
+def page_versions_statement(
+    skip: int = 0, limit: int = 100, after_id: Optional[int] = None, filters: Optional[Dict[str, object]] = None
+):
+    """Select the (id, version) keys of a list page, in the same order as the page itself."""
+    return page_statement(select(Character.id, Character.version), skip, limit, after_id, filters)
+
+
+def response_columns(fields: Optional[Sequence[str]] = None) -> tuple:
+    """The id and version columns, followed by the requested response columns (all when fields is None)."""
+    if fields is None:
+        return (Character.id, Character.version, *RESPONSE_COLUMNS)
+    return (Character.id, Character.version, *(getattr(Character, field) for field in fields))
+
+
+def projection_statement(name: str, fields: Optional[Sequence[str]] = None):
+    """Select only the requested columns of the character with a matching name."""
+    return select(*response_columns(fields)).where(name_matches(name)).limit(1)
+
+
+def page_rows_statement(
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+    filters: Optional[Dict[str, object]] = None,
+):
+    """Select the id, version and response columns of a list page as plain tuples."""
+    return page_statement(select(*response_columns(fields)), skip, limit, after_id, filters)
+
+
+def rows_by_id_statement(ids: Iterable[int]):
+    """Select the id, version and response columns of the given characters."""
+    return select(*response_columns()).where(Character.id.in_(list(ids)))
+
+
+def names_statement(names: Iterable[str]):
+    """Select the id, version and response columns of the characters with any of the names (case-insensitive)."""
+    lowered = sorted({name.lower() for name in names})
+    return select(*response_columns()).where(func.lower(Character.name).in_(lowered))
+
+
+def search_result(row: Row, score: float) -> dict:
+    """CharacterResponse dict of a search hit, with its score."""
+    result = {field: getattr(row, field) for field in RESPONSE_FIELDS}
+    result["score"] = round(score, 3)
+    return result
+
+
+def ranked_results(rows: Iterable[Row], ranked: List[tuple]) -> List[dict]:
+    """Search hits in the order of the in-memory ranking of (id, score) pairs."""
+    by_id = {row.id: row for row in rows}
+    return [search_result(by_id[character_id], score) for character_id, score in ranked if character_id in by_id]
+
+
+def insert_statement(character_data: dict):
+    """INSERT one character, returning the stored row."""
+    return insert(characters_table).values(**character_data).returning(*characters_table.columns)
+
+
+def update_statement(character_data: dict):
+    """UPDATE the character with a matching name, returning the stored row."""
+    return (
+        update(characters_table)
+        .where(name_matches(character_data["name"]))
+        .values(**character_data, version=characters_table.c.version + 1)
+        .returning(*characters_table.columns)
+    )
+
+
+def delete_statement(name: str):
+    """DELETE the character with a matching name, returning its id."""
+    return delete(characters_table).where(name_matches(name)).returning(characters_table.c.id)
+
+
+def selection_conditions(names: Optional[List[str]] = None, filters: Optional[Dict[str, object]] = None) -> list:
+    """WHERE conditions of a bulk delete: the names (case-insensitive) if given, else the list filters."""
+    if names is not None:
+        return [func.lower(Character.name).in_(sorted({name.lower() for name in names}))]
+    return filter_conditions(filters)
+
+
+def count_statement(conditions: list):
+    """Count the characters matching the conditions."""
+    return select(func.count()).select_from(characters_table).where(*conditions)
+
+
+def bulk_delete_statement(conditions: list):
+    """DELETE every character matching the conditions in one statement, returning their names."""
+    return delete(characters_table).where(*conditions).returning(characters_table.c.name)
+
+
+def dialect_insert(dialect_name: str):
+    """Return the dialect-specific insert() that supports ON CONFLICT."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Bulk upsert is not supported for database backend '{dialect_name}'")
+    return insert
+
+
+def upsert_statement(dialect_name: str, rows: List[dict], update_existing: bool):
+    """Build one multi-row INSERT that resolves name conflicts on the lower(name) index.
+
+    It returns the name and version of every row it wrote; rows skipped by DO NOTHING are not returned.
+    """
+    insert = dialect_insert(dialect_name)
+    statement = insert(Character).values(rows)
+    conflict_target = [func.lower(Character.name)]
+    if not update_existing:
+        statement = statement.on_conflict_do_nothing(index_elements=conflict_target)
+    else:
+        statement = statement.on_conflict_do_update(
+            index_elements=conflict_target,
+            set_={**{key: statement.excluded[key] for key in rows[0]}, "version": Character.version + 1},
+        )
+    return statement.returning(Character.name, Character.version)
+
+
+def bulk_statuses(rows: List[dict], written: Iterable[Row]) -> List[str]:
+    """Per-row status of a bulk write, from the (name, version) rows its upsert returned.
+
+    A row that was not returned hit an existing name under DO NOTHING; a returned row
+    still at the initial version was inserted, any other was updated.
+    """
+    versions = {name.lower(): version for name, version in written}
+    statuses = []
+    for row in rows:
+        version = versions.get(row["name"].lower())
+        if version is None:
+            statuses.append(BULK_CONFLICT)
+        elif version == INITIAL_VERSION:
+            statuses.append(BULK_CREATED)
+        else:
+            statuses.append(BULK_UPDATED)
+    return statuses
 
 
 class CharacterService:
     """Service for handling character business logic."""
 
     @staticmethod
-    def get_all_characters(db: Session, skip: int = 0, limit: int = 100) -> List[Character]:
-        """Get all characters with pagination."""
-        return db.query(Character).offset(skip).limit(limit).all()
+    def get_all_characters(
+        db: Session, skip: int = 0, limit: int = 100, filters: Optional[Dict[str, object]] = None
+    ) -> List[Character]:
+        """Get all characters matching the filters with pagination."""
+        return db.scalars(page_statement(select(Character), skip, limit, filters=filters)).all()
+
+    @staticmethod
+    def get_characters_after(
+        db: Session, after_id: int = 0, limit: int = 100, filters: Optional[Dict[str, object]] = None
+    ) -> List[Character]:
+        """Get characters matching the filters with id greater than after_id (keyset pagination)."""
+        return db.scalars(page_statement(select(Character), limit=limit, after_id=after_id, filters=filters)).all()
 
     @staticmethod
     def get_character_by_name(name: str, db: Session) -> Character:
         """Get character by name (case-insensitive)."""
-        character = db.query(Character).filter(
-            func.lower(Character.name) == name.lower()
-        ).first()
+        character = db.query(Character).filter(name_matches(name)).first()
 
         if not character:
-            raise HTTPException(
-                status_code=400,
-                detail="Character with this name not found"
-            )
+            raise HTTPException(status_code=400, detail=CHARACTER_NOT_FOUND_MSG)
 
         return character
 
     @staticmethod
-    def create_character(character_data: dict, db: Session) -> Character:
-        """Create a new character."""
-        # Check if character already exists
-        existing_character = db.query(Character).filter(
-            func.lower(Character.name) == character_data["name"].lower()
-        ).first()
-
-        if existing_character:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": "Character with this name already exists. Please try using a different name.",
-                    "name": character_data["name"]
-                }
-            )
-
-        # Create new character
-        try:
-            new_character = Character(**character_data)
-            db.add(new_character)
-            db.commit()
-            db.refresh(new_character)
-            return new_character
-        except Exception:
-            db.rollback()
-            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when creating character")
+    def get_characters_by_names(names: List[str], db: Session) -> List[Row]:
+        """Get the characters with the given names (case-insensitive) in a single IN query."""
+        return db.execute(names_statement(names)).all()
 
     @staticmethod
-    def update_character(character_data: dict, db: Session) -> Character:
-        """Update an existing character."""
-        character = db.query(Character).filter(
-            func.lower(Character.name) == character_data["name"].lower()
-        ).first()
+    def get_character_fields(name: str, db: Session, fields: Optional[Sequence[str]] = None) -> Row:
+        """Get (id, version, *fields) of a character by name, loading only those columns."""
+        character = db.execute(projection_statement(name, fields)).first()
 
         if not character:
-            raise HTTPException(status_code=404, detail="Character not found for update")
+            raise HTTPException(status_code=400, detail=CHARACTER_NOT_FOUND_MSG)
+
+        return character
+
+    @staticmethod
+    def get_character_version(name: str, db: Session) -> Optional[Row]:
+        """Get the (id, version) of a character without loading the row."""
+        return db.execute(version_statement(name)).first()
+
+    @staticmethod
+    def get_page_versions(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        filters: Optional[Dict[str, object]] = None,
+    ) -> List[Row]:
+        """Get the (id, version) keys of a list page without loading the rows."""
+        return db.execute(page_versions_statement(skip, limit, after_id, filters)).all()
+
+    @staticmethod
+    def get_page_rows(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, object]] = None,
+    ) -> List[Row]:
+        """Get a list page as (id, version, *fields) rows, without building ORM objects."""
+        return db.execute(page_rows_statement(skip, limit, after_id, fields, filters)).all()
+
+    @staticmethod
+    def search_characters(query: str, db: Session, limit: int = 20) -> List[dict]:
+        """Rank characters by a fuzzy match of the query on name and other_aliases."""
+        if db.get_bind().dialect.name != "postgresql":
+            if search_index.needs_rebuild():
+                generation = search_index.generation
+                search_index.build(db.execute(index_source_statement()), generation)
+            ranked = search_index.search(query, limit)
+            rows = db.execute(rows_by_id_statement(character_id for character_id, _ in ranked)).all()
+            return ranked_results(rows, ranked)
 
-        # Update fields
         try:
-            for key, value in character_data.items():
-                setattr(character, key, value)
+            for statement in search_settings_statements():
+                db.execute(statement)
+            rows = db.execute(trigram_search_statement(query, limit, response_columns())).all()
+        except DBAPIError as e:
+            db.rollback()
+            if is_query_canceled(e):
+                raise HTTPException(status_code=503, detail=SEARCH_TIMEOUT_MSG)
+            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when searching characters")
+        # Ending the transaction also resets the SET LOCAL settings
+        db.rollback()
+        return [search_result(row, row.score) for row in rows]
 
+    @staticmethod
+    def create_character(character_data: dict, db: Session) -> Row:
+        """Create a new character with a single INSERT ... RETURNING."""
+        try:
+            character = db.execute(insert_statement(character_data)).one()
             db.commit()
-            db.refresh(character)
             return character
+        except IntegrityError:
+            # The unique lower(name) index rejected the row
+            db.rollback()
+            raise CharacterAlreadyExistsError(character_data["name"])
         except Exception:
             db.rollback()
-            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when updating character")
+            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when creating character")
 
     @staticmethod
-    def delete_character(name: str, db: Session) -> str:
-        """Delete a character by name."""
-        character = db.query(Character).filter(
-            func.lower(Character.name) == name.lower()
-        ).first()
+    def update_character(character_data: dict, db: Session) -> Row:
+        """Update an existing character with a single UPDATE ... RETURNING."""
+        try:
+            character = db.execute(update_statement(character_data)).first()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when updating character")
 
         if not character:
-            raise HTTPException(status_code=400, detail="Deletion not possible")
+            raise HTTPException(status_code=404, detail="Character not found for update")
 
+        return character
+
+    @staticmethod
+    def delete_character(name: str, db: Session) -> str:
+        """Delete a character by name with a single DELETE ... RETURNING."""
         try:
-            db.delete(character)
+            deleted = db.execute(delete_statement(name)).first()
             db.commit()
-            return f"Character {name} deleted"
         except Exception:
             db.rollback()
             raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when deleting character")
 
+        if not deleted:
+            raise HTTPException(status_code=400, detail="Deletion not possible")
+
+        return f"Character {name} deleted"
+
+    @staticmethod
+    def bulk_delete_characters(
+        db: Session,
+        names: Optional[List[str]] = None,
+        filters: Optional[Dict[str, object]] = None,
+        max_rows: int = 1000,
+        dry_run: bool = False,
+    ) -> Tuple[int, List[str]]:
+        """Delete every character with one of the names, or matching the filters, in one statement.
+
+        Returns the number of matching characters and the deleted names. Nothing is
+        deleted on a dry run, or when more than max_rows characters match.
+        """
+        conditions = selection_conditions(names, filters)
+        # The count must see what the DELETE will see
+        use_primary(db)
+        try:
+            matched = db.execute(count_statement(conditions)).scalar_one()
+            deleted = []
+            if not dry_run and matched <= max_rows:
+                deleted = list(db.execute(bulk_delete_statement(conditions)).scalars())
+                # Rows may have been added between the count and the delete
+                matched = len(deleted)
+            if dry_run or matched > max_rows:
+                db.rollback()
+            else:
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"{DATABASE_ERROR_MSG} when deleting characters")
+
+        if matched > max_rows and not dry_run:
+            raise HTTPException(status_code=400, detail=BULK_DELETE_CAP_MSG.format(matched=matched, max_rows=max_rows))
+
+        return matched, deleted
+
+    @staticmethod
+    def bulk_upsert_characters(characters: List[dict], db: Session, update_existing: bool = True) -> List[str]:
+        """Create or update many characters with one INSERT ... ON CONFLICT per chunk.
+
+        Names must be unique (case-insensitively) within the batch. Returns the
+        status of every character, in input order. Each chunk is committed on its
+        own: the characters of a chunk that fails are reported as failed and the
+        following chunks are still written.
+        """
+        dialect_name = db.get_bind().dialect.name
+        statuses = []
+        for start in range(0, len(characters), BULK_CHUNK_SIZE):
+            chunk = characters[start:start + BULK_CHUNK_SIZE]
+            try:
+                written = db.execute(upsert_statement(dialect_name, chunk, update_existing)).all()
+                db.commit()
+            except Exception:
+                db.rollback()
+                statuses.extend([BULK_FAILED] * len(chunk))
+                continue
+            statuses.extend(bulk_statuses(chunk, written))
+        return statuses
+
     @staticmethod
     def check_db_connection(db: Session) -> bool:
         """Check database connection."""
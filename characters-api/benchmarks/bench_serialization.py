@@ -0,0 +1,99 @@
+"""Benchmark list page serialization: CharacterResponse validation against the fast JSON path.
+
+Seeds a temporary SQLite database and times GET /characters?limit=N in-process, once through
+the response_model path (ORM objects validated by CharacterResponse, then
+jsonable_encoder) and once with FAST_JSON_RESPONSES (column tuples encoded
+straight to bytes). Both bodies are compared before timing so the fast path is
+checked to return the same JSON.
+
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --rows 5000 --limit 1000 --requests 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# app.config reads the environment at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_serialization.db"
+os.environ["DATABASE_ASYNC"] = "false"
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app import configdb  # noqa: E402
+from app.api.responses import orjson  # noqa: E402
+from app.api.routes import characters  # noqa: E402
+from app.model import Character  # noqa: E402
+
+
+def seed(rows: int) -> None:
+    with configdb.engine.begin() as conn:
+        conn.execute(insert(Character), [
+            {
+                "name": f"Character_{n}",
+                "education": "High school",
+                "height": 180.0 + n % 20,
+                "identity": "Secret",
+                "other_aliases": None,
+                "universe": "Marvel Universe",
+                "weight": 80.5,
+            }
+            for n in range(rows)
+        ])
+
+
+def fetch(client: TestClient, fast: bool, params: dict):
+    characters.FAST_JSON_RESPONSES = fast
+    response = client.get("/characters", params=params)
+    response.raise_for_status()
+    return response
+
+
+def time_requests(client: TestClient, fast: bool, params: dict, requests: int) -> list:
+    """Return per-request latencies in milliseconds."""
+    fetch(client, fast, params)
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        fetch(client, fast, params)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list page serialization paths.")
+    parser.add_argument("--rows", type=int, default=2000, help="Characters seeded.")
+    parser.add_argument("--limit", type=int, default=1000, help="Page size requested.")
+    parser.add_argument("--requests", type=int, default=100, help="Requests timed per path.")
+    args = parser.parse_args()
+
+    configdb.create_schema()
+    seed(args.rows)
+    app = FastAPI()
+    app.include_router(characters.router)
+    client = TestClient(app)
+
+    for params in ({"limit": args.limit}, {"limit": args.limit, "cursor": ""}):
+        slow, fast = fetch(client, False, params), fetch(client, True, params)
+        assert json.loads(slow.content) == json.loads(fast.content), "fast path changed the JSON"
+        assert slow.headers["ETag"] == fast.headers["ETag"], "fast path changed the ETag"
+
+    params = {"limit": args.limit}
+    print(f"rows: {args.rows}  limit: {args.limit}  encoder: {'orjson' if orjson else 'json'}")
+    print(f"{'path':>14} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for label, fast in (("response_model", False), ("fast", True)):
+        latencies = sorted(time_requests(client, fast, params, args.requests))
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{label:>14} {statistics.median(latencies):>9.3f} {p95:>9.3f} {latencies[-1]:>9.3f}")
+
+    configdb.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
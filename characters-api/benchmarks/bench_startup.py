@@ -0,0 +1,78 @@
+"""Benchmark worker startup: importing the app, then running its lifespan startup.
+
+Every sample runs in a fresh interpreter, the way each `uvicorn --workers N`
+process starts. It reports how long `import main` takes, how long the lifespan
+startup takes on top of it, and whether the import touched the database: the
+SQLite file behind DATABASE_URL must not exist until the lifespan has run.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --samples 20 --auto-create-schema
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter and prints its timings as JSON
+PROBE = """
+import asyncio, json, os, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+database_touched = os.path.exists(sys.argv[1])
+
+async def startup():
+    async with main.app.router.lifespan_context(main.app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "database_touched_on_import": database_touched,
+}))
+"""
+
+
+def sample(database_path: str, auto_create_schema: bool) -> dict:
+    if os.path.exists(database_path):
+        os.remove(database_path)
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{database_path}",
+        DATABASE_ASYNC="false",
+        AUTO_CREATE_SCHEMA=str(auto_create_schema).lower(),
+        PYTHONPATH=APP_DIR,
+    )
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE, database_path],
+        cwd=APP_DIR, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark app import and lifespan startup time.")
+    parser.add_argument("--samples", type=int, default=10, help="Fresh interpreters started.")
+    parser.add_argument("--auto-create-schema", action="store_true", help="Run create_all in the lifespan.")
+    args = parser.parse_args()
+
+    database_path = os.path.join(tempfile.mkdtemp(), "bench_startup.db")
+    samples = [sample(database_path, args.auto_create_schema) for _ in range(args.samples)]
+
+    print(f"samples: {args.samples}  AUTO_CREATE_SCHEMA: {str(args.auto_create_schema).lower()}")
+    print(f"{'phase':>10} {'p50 ms':>9} {'max ms':>9}")
+    for phase in ("import_ms", "startup_ms"):
+        values = [s[phase] for s in samples]
+        print(f"{phase[:-3]:>10} {statistics.median(values):>9.1f} {max(values):>9.1f}")
+    touched = sum(s["database_touched_on_import"] for s in samples)
+    print(f"database touched on import: {touched}/{args.samples}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,45 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from app.config import setup_logging
-from app.api.routes import characters, health
+from app import configdb
+from app.config import AUTO_CREATE_SCHEMA, PROFILING_ENABLED, setup_logging
+from app.api.routes import admin, characters, health
+from app.db_timing import QueryTimingMiddleware
+from app.profiling import ProfilingMiddleware
+from app.services import character_cache
 
 # Setup logging
 logger = setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create this worker's engines when it starts serving and close their pools when it stops."""
+    configdb.init_engines()
+    if AUTO_CREATE_SCHEMA:
+        configdb.create_schema()
+    yield
+    character_cache.close()
+    await configdb.dispose_engines()
+
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Character API",
     description="API for managing character data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Setup Prometheus instrumentation
 Instrumentator().instrument(app).expose(app)
+app.add_middleware(QueryTimingMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 
 @app.exception_handler(RequestValidationError)
@@ -32,3 +54,4 @@ async def validation_exception_handler(request, exc: RequestValidationError):
 # Include routers
 app.include_router(health.router, tags=["health"])
 app.include_router(characters.router, tags=["characters"])
+app.include_router(admin.router, tags=["admin"])
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.model import Base, Character
+from app.services import character_service
+from app.services.character_service import (
+    BULK_CONFLICT,
+    BULK_CREATED,
+    BULK_FAILED,
+    BULK_UPDATED,
+    CharacterService,
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def names(db):
+    return sorted(db.execute(select(Character.name)).scalars())
+
+
+def test_statuses_come_from_the_written_rows(db):
+    CharacterService.bulk_upsert_characters([{"name": "Thor"}], db)
+
+    statuses = CharacterService.bulk_upsert_characters([{"name": "THOR"}, {"name": "Loki"}], db)
+    assert statuses == [BULK_UPDATED, BULK_CREATED]
+
+    statuses = CharacterService.bulk_upsert_characters([{"name": "thor"}, {"name": "Odin"}], db, update_existing=False)
+    assert statuses == [BULK_CONFLICT, BULK_CREATED]
+    assert names(db) == ["Loki", "Odin", "THOR"]
+
+
+def test_a_failed_chunk_does_not_abort_the_others(db, monkeypatch):
+    monkeypatch.setattr(character_service, "BULK_CHUNK_SIZE", 2)
+    characters = [{"name": "A"}, {"name": "B"}, {"name": "C"}, {"name": None}, {"name": "E"}]
+
+    statuses = CharacterService.bulk_upsert_characters(characters, db)
+
+    assert statuses == [BULK_CREATED, BULK_CREATED, BULK_FAILED, BULK_FAILED, BULK_CREATED]
+    assert names(db) == ["A", "B", "E"]
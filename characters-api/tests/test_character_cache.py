@@ -0,0 +1,47 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.cache import MISSING, LRUCache
+from app.services import character_cache
+from app.services.character_service import RESPONSE_FIELDS
+
+
+def character(version, **fields):
+    payload = {field: None for field in RESPONSE_FIELDS}
+    payload.update(name="Thor", **fields)
+    return SimpleNamespace(id=1, version=version, **payload)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    backend = LRUCache("test_character", 100, 60)
+    monkeypatch.setattr(character_cache, "_cache", backend)
+    monkeypatch.setattr(character_cache, "CACHE_INVALIDATION_HOLD_SECONDS", 0.2)
+    return backend
+
+
+def test_read_loaded_before_a_write_is_not_cached(cache):
+    # A GET loads version 1, then a PUT commits version 2 and invalidates before the GET stores
+    stale = character(1, universe="Old")
+    asyncio.run(character_cache.invalidate("Thor"))
+    asyncio.run(character_cache.store("Thor", stale))
+
+    assert asyncio.run(character_cache.get("thor")) is MISSING
+
+
+def test_store_does_not_replace_a_cached_entry(cache):
+    asyncio.run(character_cache.store("Thor", character(2, universe="New")))
+    asyncio.run(character_cache.store("Thor", character(1, universe="Old")))
+
+    assert asyncio.run(character_cache.get("Thor"))["result"]["universe"] == "New"
+
+
+def test_names_are_cached_again_after_the_hold(cache):
+    asyncio.run(character_cache.invalidate("Thor"))
+    time.sleep(0.25)
+    asyncio.run(character_cache.store("Thor", character(2, universe="New")))
+
+    assert asyncio.run(character_cache.get("Thor"))["result"]["universe"] == "New"
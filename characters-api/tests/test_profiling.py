@@ -0,0 +1,50 @@
+import time
+
+from app.profiling import Profiler
+
+
+def wait_for_sampler_exit(profiler: Profiler, timeout: float = 1.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while profiler.sampler._thread is not None and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return profiler.sampler._thread is None
+
+
+def test_overlapping_profiles_end_in_any_order():
+    profiler = Profiler(sample_rate=1, slow_ms=0, interval_ms=1, max_profiles=10)
+    first = profiler.begin("GET", "/characters")
+    second = profiler.begin("GET", "/character")
+    # Both Counters are still empty, hence equal: ending one must not touch the other
+    assert first.stacks == second.stacks
+
+    profiler.end(second, "/character", 1.0)
+    assert list(profiler.sampler._active) == [first.id]
+
+    profiler.end(first, "/characters", 2.0)
+    assert profiler.sampler._active == {}
+    assert [profile.id for profile in profiler.profiles] == [second.id, first.id]
+    assert wait_for_sampler_exit(profiler)
+
+
+def test_ended_profile_stops_collecting_samples():
+    profiler = Profiler(sample_rate=1, slow_ms=0, interval_ms=1, max_profiles=10)
+    first = profiler.begin("GET", "/characters")
+    second = profiler.begin("GET", "/character")
+    # Samples are added under the sampler lock, so none can land after end() returns
+    profiler.end(first, "/characters", 1.0)
+    samples = sum(first.stacks.values())
+
+    time.sleep(0.05)
+    assert sum(first.stacks.values()) == samples
+    assert sum(second.stacks.values()) > 0
+    profiler.end(second, "/character", 50.0)
+    assert wait_for_sampler_exit(profiler)
+
+
+def test_only_slow_requests_are_kept_without_sampling():
+    profiler = Profiler(sample_rate=0, slow_ms=10, interval_ms=1, max_profiles=10)
+    fast = profiler.begin("GET", "/character")
+    slow = profiler.begin("GET", "/characters")
+    profiler.end(fast, "/character", 5.0)
+    profiler.end(slow, "/characters", 15.0)
+    assert [(profile.id, profile.reason) for profile in profiler.profiles] == [(slow.id, "slow")]
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+import fakeredis
+
+from app.cache import MISSING, LRUCache, RedisCacheBackend
+from app.services import character_cache
+
+
+def make_backend(server, local_ttl_seconds=None):
+    local = LRUCache("test_local", 100, local_ttl_seconds) if local_ttl_seconds else None
+    client = fakeredis.FakeRedis(server=server)
+    return RedisCacheBackend("test", client, ttl_seconds=60, prefix="test:", channel="test:invalidate", local=local)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def server_subscribers(backend):
+    return backend.client.pubsub_numsub(backend.channel)[0][1]
+
+
+def test_set_and_get_are_shared_between_replicas():
+    server = fakeredis.FakeServer()
+    first, second = make_backend(server), make_backend(server)
+
+    first.set("thor", {"etag": '"1-1"', "result": {"name": "Thor"}})
+
+    assert second.get("thor") == {"etag": '"1-1"', "result": {"name": "Thor"}}
+    assert second.get("loki") is MISSING
+    first.delete("thor")
+    assert second.get("thor") is MISSING
+
+
+def test_delete_evicts_local_copies_on_every_replica():
+    server = fakeredis.FakeServer()
+    first, second = make_backend(server, local_ttl_seconds=60), make_backend(server, local_ttl_seconds=60)
+    try:
+        # Both subscribers must be listening before the invalidation is published
+        assert wait_for(lambda: server_subscribers(first) == 2)
+        first.set("thor", {"result": 1})
+        assert second.get("thor") == {"result": 1}
+        assert second.local.get("thor") == {"result": 1}
+
+        first.delete("thor")
+
+        assert wait_for(lambda: second.local.get("thor") is MISSING)
+        assert second.get("thor") is MISSING
+    finally:
+        first.close()
+        second.close()
+
+
+def test_errors_fall_back_to_a_miss():
+    server = fakeredis.FakeServer()
+    backend = make_backend(server)
+    backend.set("thor", {"result": 1})
+    server.connected = False
+
+    assert backend.get("thor") is MISSING
+    backend.set("loki", {"result": 2})
+    backend.delete("thor")
+    backend.clear()
+
+
+def test_blocking_backend_is_called_off_the_event_loop(monkeypatch):
+    backend = make_backend(fakeredis.FakeServer())
+    threads = []
+    original_get = backend.get
+
+    def recording_get(key):
+        threads.append(threading.get_ident())
+        return original_get(key)
+
+    monkeypatch.setattr(backend, "get", recording_get)
+    monkeypatch.setattr(character_cache, "_cache", backend)
+
+    assert asyncio.run(character_cache.get("Thor")) is MISSING
+    assert threads and threads[0] != threading.get_ident()
+
+
+def test_invalidated_keys_refuse_stores_from_other_replicas():
+    server = fakeredis.FakeServer()
+    first, second = make_backend(server), make_backend(server)
+    first.set("thor", {"result": 1})
+
+    first.invalidate("thor", hold_seconds=60)
+
+    assert second.get("thor") is MISSING
+    assert second.add("thor", {"result": 1}) is False
+    assert second.get("thor") is MISSING
+    assert second.add("loki", {"result": 2}) is True
+    assert second.add("loki", {"result": 3}) is False
+    assert first.get("loki") == {"result": 2}